@@ -8,7 +8,12 @@ import re
 import unicodedata
 
 MD_RESERVED_SAFE = r"\\|\||\*|_|~|#|>|\[|\]|\(|\)|\{|\}|\+|\-|\.|!|`"
-MD_ESCAPE_RE = re.compile(MD_RESERVED_SAFE)
+# Same characters as MD_RESERVED_SAFE, as one character class
+MD_ESCAPE_RE = re.compile(r"[\\|*_~#>\[\](){}+\-.!`]")
+
+
+def _backslash_match(m) -> str:
+    return "\\" + m.group(0)
 
 NUMERIC_PATTERN = re.compile(
     r"""
@@ -45,18 +50,20 @@ CONTROL_REMOVE_RANGES = [
 ]
 
 
+# Regex and str.strip forms of the sets above, so per-character scans run in C
+CONTROL_REMOVE_RE = re.compile(
+    "[" + "".join(f"{re.escape(chr(lo))}-{re.escape(chr(hi))}" for lo, hi in CONTROL_REMOVE_RANGES) + "]"
+)
+_WHITESPACE_STR = "".join(WHITESPACE_CHARS)
+
+
 def remove_control_chars(text: str) -> str:
-    out = []
-    for ch in text:
-        code = ord(ch)
-        if any(lo <= code <= hi for lo, hi in CONTROL_REMOVE_RANGES):
-            continue
-        out.append(ch)
-    return "".join(out)
+    return CONTROL_REMOVE_RE.sub("", text)
 
 
 def is_whitespace_only(s: str) -> bool:
-    return all((c in WHITESPACE_CHARS) for c in s) and len(s) > 0
+    # Stripping every whitespace character leaves nothing only when all of s is whitespace
+    return len(s) > 0 and not s.strip(_WHITESPACE_STR)
 
 
 def md_escape(s: str, level: str = "safe") -> str:
@@ -65,9 +72,10 @@ def md_escape(s: str, level: str = "safe") -> str:
     s = s.replace("\r\n", "\n").replace("\r", "\n").replace("\n", "<br>")
     s = s.replace("|", r"\|")
     if level == "safe":
-        s = MD_ESCAPE_RE.sub(lambda m: "\\" + m.group(0), s)
+        s = MD_ESCAPE_RE.sub(_backslash_match, s)
     elif level == "aggressive":
-        s = re.sub(r".", lambda m: "\\" + m.group(0), s)
+        # Every character gets a backslash (no newlines remain at this point)
+        s = "\\" + "\\".join(s)
     return s
 
 
@@ -224,14 +232,19 @@ def numeric_like(s: str) -> bool:
     m = NUMERIC_PATTERN.match(s)
     if not m:
         return False
-    open_paren = m.group(1)
-    groups = m.groups()
-    close_paren = groups[-2] if len(groups) >= 2 else None
-    if open_paren and not close_paren:
-        return False
-    if close_paren and not open_paren:
-        return False
-    return True
+    # Parentheses (negative numbers) must be balanced; groups 1 and 7 are the
+    # opening and closing parenthesis
+    open_paren, close_paren = m.group(1, 7)
+    return (open_paren is None) == (close_paren is None)
+
+
+def numeric_normalization_enabled(opts) -> bool:
+    """Whether normalize_numeric_text can change anything under these options."""
+    return (
+        opts.get("currency_symbol", "keep") == "strip"
+        or opts.get("numeric_thousand_sep", "keep") == "remove"
+        or opts.get("percent_format", "keep") == "numeric"
+    )
 
 
 def normalize_numeric_text(s: str, opts) -> str:
@@ -271,8 +284,14 @@ def hyperlink_info(cell):
     return {"target": target, "location": location, "display": display}
 
 
+# Link prefixes accepted by is_valid_url
+URL_PREFIX_RE = re.compile(r"(?:https?://|mailto:|file://|/|\.{1,2}/)")
+
+
 def is_valid_url(target: str) -> bool:
-    return bool(re.match(r"^(https?://|mailto:|file://|/|\.{1,2}/)", target or ""))
+    if not target:
+        return False
+    return URL_PREFIX_RE.match(target) is not None
 
 def has_border(cell):
     """Check if cell has any border lines.
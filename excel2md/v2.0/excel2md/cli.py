@@ -78,6 +78,7 @@ def build_argparser():
 
     # Sheet output options
     p.add_argument("--split-by-sheet", action="store_true", default=False, help="Split output by sheet (generate separate file for each sheet)")
+    p.add_argument("--workers", type=int, default=1, help="Number of worker processes for per-sheet conversion (default: 1, 0: auto = min(sheets, CPUs))")
 
     return p
 
@@ -8,7 +8,7 @@ from pathlib import Path
 from typing import Dict, Tuple, Optional
 
 from .cell_utils import cell_display_value, normalize_numeric_text, hyperlink_info
-from .output import warn, info
+from .output import warn, warn_once, info
 from .workbook_loader import a1_from_rc
 from . import __version__ as VERSION
 
@@ -38,7 +38,134 @@ def format_timestamp():
     from datetime import datetime
     return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
-def write_csv_markdown(wb, csv_data_dict, excel_file_basename, opts, output_dir):
+def _write_csv_markdown_content(f, wb, csv_data_dict, excel_file_basename, opts):
+    """Write the CSV markdown document (without verification metadata) to stream f."""
+    import csv as csv_module
+    from io import StringIO
+
+    # Get current timestamp
+    timestamp = format_timestamp()
+
+    # Determine if this is single-sheet or multi-sheet output
+    is_single_sheet = len(csv_data_dict) == 1
+    sheet_names = list(csv_data_dict.keys())
+
+    include_description = opts.get("csv_include_description", True)
+
+    # Sections are collected and written to f in one call
+    parts = []
+    write = parts.append
+
+    if is_single_sheet:
+        write(f"# {sheet_names[0]}\n\n")
+        if include_description:
+            write(f"- 仕様バージョン: {VERSION}\n")
+            write(f"- 元ファイル: {wb.properties.title or Path(excel_file_basename).name}.xlsx\n\n")
+    else:
+        write(f"# CSV出力: {excel_file_basename}.xlsx\n\n")
+
+    # Overview section
+    if include_description:
+        write("## 概要\n\n")
+
+        # File Information (level 3) - only for multi-sheet
+        if not is_single_sheet:
+            write("### ファイル情報\n\n")
+            write(f"- 元のExcelファイル名: {excel_file_basename}.xlsx\n")
+            write(f"- シート数: {len(csv_data_dict)}\n")
+            write(f"- 生成日時: {timestamp}\n\n")
+
+            # About This File (level 3)
+            write("### このファイルについて\n\n")
+            write("このCSVマークダウンファイルは、AIがExcelの内容を理解できるよう、各シートの印刷領域をCSV形式で出力したファイルです。")
+            write("各シートはマークダウン見出しで区切られ、CSVコードブロックで内容が記載されています。")
+        else:
+            # Single-sheet: simplified description
+            write("このCSVマークダウンファイルは、AIがExcelの内容を理解できるよう、シートの印刷領域をCSV形式で出力したファイルです。")
+        # Add metadata description only if metadata is enabled
+        if opts.get("csv_include_metadata", True):
+            write("ファイル末尾に検証用メタデータセクションがあり、Excel原本との整合性を確認できます。")
+        write("\n\n")
+
+        # CSV Generation Method (level 3)
+        write("### CSV生成方法\n\n")
+        sheet_text = "シート" if is_single_sheet else "各シート"
+        write(f"- **出力対象範囲**: {sheet_text}の印刷領域のみを出力（印刷領域外のセルは含まない）\n")
+        write(f"- **印刷領域の統合**: 複数の印刷領域がある場合は外接矩形として統合\n")
+        write(f"- **テーブル分割なし**: Markdown出力と異なり、空行・空列でテーブル分割せず印刷領域全体を1つのCSVとして出力\n")
+        write(f"- **結合セルの処理**: `{opts.get('merge_policy', 'top_left_only')}` 設定に従って処理\n")
+        write(f"- **数式の扱い**: `{opts.get('value_mode', 'display')}` 設定に従って表示値・数式・両方のいずれかを出力\n")
+        write(f"- **値の正規化**: `{opts.get('csv_normalize_values', True)}` 設定に従って正規化処理を適用\n\n")
+
+        # CSV Format Specification (level 3)
+        write("### CSV形式の仕様\n\n")
+        write(f"- **区切り文字**: `{opts.get('csv_delimiter', ',')}`\n")
+        write(f"- **引用符の使用**: `{opts.get('csv_quoting', 'minimal')}` 設定に従い、RFC 4180準拠で処理\n")
+        write(f"- **セル内改行**: 半角スペースに変換される（1レコード=1行を保証）\n")
+        write(f"- **セル内特殊文字**: 区切り文字や引用符は引用符でエスケープされる\n")
+        write(f"- **エンコーディング**: `{opts.get('csv_encoding', 'utf-8')}`\n")
+        write(f"- **空セルの表現**: 空文字列として出力（空行・空列も含めて出力される）\n")
+        # Hyperlink mode description
+        hyperlink_mode = opts.get("hyperlink_mode", "inline_plain")
+        if hyperlink_mode == "text_only":
+            write(f"- **ハイパーリンク**: 表示テキストのみを出力（リンク先URLは含まない）\n\n")
+        elif hyperlink_mode == "inline":
+            write(f"- **ハイパーリンク**: Markdown形式で出力（例: `[表示テキスト](URL)` または `[表示テキスト](シート名+セル番号)`）\n\n")
+        else:  # inline_plain or footnote or both (after fallback)
+            write(f"- **ハイパーリンク**: 平文形式で出力（例: `表示テキスト (URL)` または `表示テキスト (→シート名+セル番号)`）\n\n")
+
+        # About Mermaid (level 3) - only when mermaid is enabled with shapes mode
+        mermaid_enabled = opts.get("mermaid_enabled", False)
+        mermaid_detect_mode = opts.get("mermaid_detect_mode", "shapes")
+        if mermaid_enabled and mermaid_detect_mode == "shapes":
+            write("### Mermaidフローチャートについて\n\n")
+            write("- ExcelのShape（図形）を検出し、Mermaid記法のフローチャートとして出力しています\n")
+            write("- 各シートのCSVブロックの前に、検出されたShapeがMermaidコードブロックで記載されます\n")
+            write("- Shape間の接続（コネクタ）も矢印として表現されます\n\n")
+
+        # About Verification Metadata (level 3)
+        include_metadata = opts.get("csv_include_metadata", True)
+        if include_metadata:
+            write("### 検証用メタデータについて\n\n")
+            write(f"- このファイルの末尾に「検証用メタデータ」セクションが付記されています\n")
+            write(f"- メタデータには各シートのExcel原本情報（範囲、行数、列数）とCSV出力結果の比較が含まれます\n")
+            write(f"- 検証ステータス（OK/FAILED）により、CSVとExcel原本の整合性を確認できます\n")
+            write(f"- 詳細情報はファイル末尾の「検証用メタデータ」セクションを参照してください\n\n")
+
+        # Separator between overview and CSV sections
+        write("---\n\n")
+
+    # Write each sheet's CSV data in code blocks
+    for sheet_name, sheet_data in csv_data_dict.items():
+        # For single-sheet mode, don't add sheet name header (already in title)
+        if not is_single_sheet:
+            write(f"## {sheet_name}\n\n")
+
+        # Write Mermaid block before CSV if mermaid_enabled=true and mermaid exists
+        if isinstance(sheet_data, dict) and sheet_data.get("mermaid"):
+            write(sheet_data["mermaid"])
+            write("\n\n")
+
+        # Extract rows from new data structure
+        rows = sheet_data["rows"] if isinstance(sheet_data, dict) else sheet_data
+
+        if rows:
+            # Generate CSV string using csv.writer for RFC 4180 compliance
+            output = StringIO()
+            writer = csv_module.writer(output, delimiter=',', quoting=csv_module.QUOTE_MINIMAL, lineterminator='\n')
+            writer.writerows(rows)
+            csv_content = output.getvalue()
+
+            # Write CSV code block
+            write("```csv\n")
+            write(csv_content)
+            write("```\n\n")
+        else:
+            write("```csv\n```\n\n")
+
+    f.write("".join(parts))
+
+def write_csv_markdown(wb, csv_data_dict, excel_file_basename, opts, output_dir, out_stream=None):
     """Write CSV markdown file containing sheets' CSV data.
 
     Args:
@@ -50,139 +177,29 @@ def write_csv_markdown(wb, csv_data_dict, excel_file_basename, opts, output_dir)
                             For normal mode: just file name (e.g., "file")
         opts: Options dictionary
         output_dir: Output directory path
+        out_stream: Optional writable text stream. When given, the document is written
+                    to it instead of a file in output_dir, and the verification metadata
+                    (appended to the file on disk) is skipped.
 
     Returns:
-        Path to created CSV markdown file, or None if failed
+        Path to created CSV markdown file (out_stream itself when given), or None if failed
     """
-    import csv as csv_module
-    from io import StringIO
-    import json
-
     try:
         if not csv_data_dict:
             return None
 
+        # Stream output: no file, so no path-based verification metadata either
+        if out_stream is not None:
+            _write_csv_markdown_content(out_stream, wb, csv_data_dict, excel_file_basename, opts)
+            return out_stream
+
         # Prepare output file path
         output_dir_path = Path(output_dir)
         output_dir_path.mkdir(parents=True, exist_ok=True)
         csv_md_path = output_dir_path / f"{excel_file_basename}_csv.md"
 
-        # Get current timestamp
-        timestamp = format_timestamp()
-
-        # Determine if this is single-sheet or multi-sheet output
-        is_single_sheet = len(csv_data_dict) == 1
-        sheet_names = list(csv_data_dict.keys())
-
-        include_description = opts.get("csv_include_description", True)
-
         with open(csv_md_path, 'w', encoding='utf-8') as f:
-            if is_single_sheet:
-                f.write(f"# {sheet_names[0]}\n\n")
-                if include_description:
-                    f.write(f"- 仕様バージョン: {VERSION}\n")
-                    f.write(f"- 元ファイル: {wb.properties.title or Path(excel_file_basename).name}.xlsx\n\n")
-            else:
-                f.write(f"# CSV出力: {excel_file_basename}.xlsx\n\n")
-
-            # Overview section
-            if include_description:
-                f.write("## 概要\n\n")
-
-                # File Information (level 3) - only for multi-sheet
-                if not is_single_sheet:
-                    f.write("### ファイル情報\n\n")
-                    f.write(f"- 元のExcelファイル名: {excel_file_basename}.xlsx\n")
-                    f.write(f"- シート数: {len(csv_data_dict)}\n")
-                    f.write(f"- 生成日時: {timestamp}\n\n")
-
-                    # About This File (level 3)
-                    f.write("### このファイルについて\n\n")
-                    f.write("このCSVマークダウンファイルは、AIがExcelの内容を理解できるよう、各シートの印刷領域をCSV形式で出力したファイルです。")
-                    f.write("各シートはマークダウン見出しで区切られ、CSVコードブロックで内容が記載されています。")
-                else:
-                    # Single-sheet: simplified description
-                    f.write("このCSVマークダウンファイルは、AIがExcelの内容を理解できるよう、シートの印刷領域をCSV形式で出力したファイルです。")
-                # Add metadata description only if metadata is enabled
-                if opts.get("csv_include_metadata", True):
-                    f.write("ファイル末尾に検証用メタデータセクションがあり、Excel原本との整合性を確認できます。")
-                f.write("\n\n")
-
-                # CSV Generation Method (level 3)
-                f.write("### CSV生成方法\n\n")
-                sheet_text = "シート" if is_single_sheet else "各シート"
-                f.write(f"- **出力対象範囲**: {sheet_text}の印刷領域のみを出力（印刷領域外のセルは含まない）\n")
-                f.write(f"- **印刷領域の統合**: 複数の印刷領域がある場合は外接矩形として統合\n")
-                f.write(f"- **テーブル分割なし**: Markdown出力と異なり、空行・空列でテーブル分割せず印刷領域全体を1つのCSVとして出力\n")
-                f.write(f"- **結合セルの処理**: `{opts.get('merge_policy', 'top_left_only')}` 設定に従って処理\n")
-                f.write(f"- **数式の扱い**: `{opts.get('value_mode', 'display')}` 設定に従って表示値・数式・両方のいずれかを出力\n")
-                f.write(f"- **値の正規化**: `{opts.get('csv_normalize_values', True)}` 設定に従って正規化処理を適用\n\n")
-
-                # CSV Format Specification (level 3)
-                f.write("### CSV形式の仕様\n\n")
-                f.write(f"- **区切り文字**: `{opts.get('csv_delimiter', ',')}`\n")
-                f.write(f"- **引用符の使用**: `{opts.get('csv_quoting', 'minimal')}` 設定に従い、RFC 4180準拠で処理\n")
-                f.write(f"- **セル内改行**: 半角スペースに変換される（1レコード=1行を保証）\n")
-                f.write(f"- **セル内特殊文字**: 区切り文字や引用符は引用符でエスケープされる\n")
-                f.write(f"- **エンコーディング**: `{opts.get('csv_encoding', 'utf-8')}`\n")
-                f.write(f"- **空セルの表現**: 空文字列として出力（空行・空列も含めて出力される）\n")
-                # Hyperlink mode description
-                hyperlink_mode = opts.get("hyperlink_mode", "inline_plain")
-                if hyperlink_mode == "text_only":
-                    f.write(f"- **ハイパーリンク**: 表示テキストのみを出力（リンク先URLは含まない）\n\n")
-                elif hyperlink_mode == "inline":
-                    f.write(f"- **ハイパーリンク**: Markdown形式で出力（例: `[表示テキスト](URL)` または `[表示テキスト](シート名+セル番号)`）\n\n")
-                else:  # inline_plain or footnote or both (after fallback)
-                    f.write(f"- **ハイパーリンク**: 平文形式で出力（例: `表示テキスト (URL)` または `表示テキスト (→シート名+セル番号)`）\n\n")
-
-                # About Mermaid (level 3) - only when mermaid is enabled with shapes mode
-                mermaid_enabled = opts.get("mermaid_enabled", False)
-                mermaid_detect_mode = opts.get("mermaid_detect_mode", "shapes")
-                if mermaid_enabled and mermaid_detect_mode == "shapes":
-                    f.write("### Mermaidフローチャートについて\n\n")
-                    f.write("- ExcelのShape（図形）を検出し、Mermaid記法のフローチャートとして出力しています\n")
-                    f.write("- 各シートのCSVブロックの前に、検出されたShapeがMermaidコードブロックで記載されます\n")
-                    f.write("- Shape間の接続（コネクタ）も矢印として表現されます\n\n")
-
-                # About Verification Metadata (level 3)
-                include_metadata = opts.get("csv_include_metadata", True)
-                if include_metadata:
-                    f.write("### 検証用メタデータについて\n\n")
-                    f.write(f"- このファイルの末尾に「検証用メタデータ」セクションが付記されています\n")
-                    f.write(f"- メタデータには各シートのExcel原本情報（範囲、行数、列数）とCSV出力結果の比較が含まれます\n")
-                    f.write(f"- 検証ステータス（OK/FAILED）により、CSVとExcel原本の整合性を確認できます\n")
-                    f.write(f"- 詳細情報はファイル末尾の「検証用メタデータ」セクションを参照してください\n\n")
-
-                # Separator between overview and CSV sections
-                f.write("---\n\n")
-
-            # Write each sheet's CSV data in code blocks
-            for sheet_name, sheet_data in csv_data_dict.items():
-                # For single-sheet mode, don't add sheet name header (already in title)
-                if not is_single_sheet:
-                    f.write(f"## {sheet_name}\n\n")
-
-                # Write Mermaid block before CSV if mermaid_enabled=true and mermaid exists
-                if isinstance(sheet_data, dict) and sheet_data.get("mermaid"):
-                    f.write(sheet_data["mermaid"])
-                    f.write("\n\n")
-
-                # Extract rows from new data structure
-                rows = sheet_data["rows"] if isinstance(sheet_data, dict) else sheet_data
-
-                if rows:
-                    # Generate CSV string using csv.writer for RFC 4180 compliance
-                    output = StringIO()
-                    writer = csv_module.writer(output, delimiter=',', quoting=csv_module.QUOTE_MINIMAL, lineterminator='\n')
-                    writer.writerows(rows)
-                    csv_content = output.getvalue()
-
-                    # Write CSV code block
-                    f.write("```csv\n")
-                    f.write(csv_content)
-                    f.write("```\n\n")
-                else:
-                    f.write("```csv\n```\n\n")
+            _write_csv_markdown_content(f, wb, csv_data_dict, excel_file_basename, opts)
 
         info(f"CSV markdown file created: {csv_md_path}")
 
@@ -300,9 +317,7 @@ def extract_print_area_for_csv(ws, area, opts, merged_lookup, cell_to_image=None
 
                 # Handle footnote/both modes -> fallback to inline_plain with warning
                 if hyperlink_mode in ("footnote", "both"):
-                    if not hasattr(extract_print_area_for_csv, '_csv_hyperlink_warning_shown'):
-                        warn("CSV markdown does not support footnote mode. Falling back to inline_plain for hyperlinks.")
-                        extract_print_area_for_csv._csv_hyperlink_warning_shown = True
+                    warn_once("CSV markdown does not support footnote mode. Falling back to inline_plain for hyperlinks.")
                     hyperlink_mode = "inline_plain"
 
                 if hl.get("target"):
@@ -7,6 +7,7 @@
 from .output import warn
 from .image_extraction import _DRAWINGML_NS
 
+import io as _io
 import re
 import re as _re
 import unicodedata as _unicodedata
@@ -14,6 +15,49 @@ import zipfile as _zipfile
 import xml.etree.ElementTree as _ET
 from typing import Dict, Tuple, Optional, List, Set, Any
 
+# DrawingML要素のClark表記タグ（{uri}local）。find/iterでプレフィックス解決を省く
+_XDR = "{" + _DRAWINGML_NS["xdr"] + "}"
+_A = "{" + _DRAWINGML_NS["a"] + "}"
+_TAG_TWO_CELL_ANCHOR = _XDR + "twoCellAnchor"
+_TAG_ONE_CELL_ANCHOR = _XDR + "oneCellAnchor"
+_TAG_SP = _XDR + "sp"
+_TAG_CXNSP = _XDR + "cxnSp"
+_TAG_CNVPR = _XDR + "cNvPr"
+_TAG_FROM = _XDR + "from"
+_TAG_TO = _XDR + "to"
+_TAG_COL = _XDR + "col"
+_TAG_ROW = _XDR + "row"
+_TAG_XDR_TXBODY = _XDR + "txBody"
+_TAG_A_TXBODY = _A + "txBody"
+_TAG_P = _A + "p"
+_TAG_R = _A + "r"
+_TAG_T = _A + "t"
+_TAG_PRSTGEOM = _A + "prstGeom"
+_TAG_STCXN = _A + "stCxn"
+_TAG_ENDCXN = _A + "endCxn"
+# workbook.xml / .rels
+_TAG_WB_SHEET = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}sheet"
+_ATTR_R_ID = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}id"
+_TAG_RELATIONSHIP = "{http://schemas.openxmlformats.org/package/2006/relationships}Relationship"
+
+def _first_descendant(elem, tag):
+    """Return the first element with the given Clark tag in document order, or None."""
+    return next(elem.iter(tag), None)
+
+# Mermaid表示名で特殊扱いされる文字 → HTMLエンティティ
+_MERMAID_ESC = str.maketrans({
+    "&": "&amp;",
+    "<": "&lt;",
+    ">": "&gt;",
+    "[": "&#91;",
+    "]": "&#93;",
+    "{": "&#123;",
+    "}": "&#125;",
+    "|": "&#124;",
+    '"': "&quot;",
+    "'": "&#39;",
+})
+
 def _v14_normalize_header_name(s: str) -> str:
     s = s or ""
     s = _unicodedata.normalize("NFKC", s)
@@ -33,6 +77,13 @@ def _v14_sanitize_node_id(name: str) -> str:
     s = _re.sub(r"_+", "_", s)
     return s
 
+def _v14_escape_mermaid_text(text: str) -> str:
+    """Mermaid表示名の特殊文字をHTMLエンティティに変換"""
+    if not text:
+        return ""
+    # 1パスで置換するため、置換結果の "&" が再エスケープされることはない
+    return text.translate(_MERMAID_ESC)
+
 def _v14_resolve_columns_by_name(header_row, mapping):
     norm_map = {k: _v14_normalize_header_name(v) for k, v in mapping.items() if v}
     index = {}
@@ -62,13 +113,6 @@ def _v14_extract_shapes_to_mermaid(xlsx_path: str, ws, opts) -> Optional[str]:
         Mermaid code block string or None if no shapes detected
     """
     try:
-        # Build cell grid {(row, col): value} (0-based)
-        grid: Dict[Tuple[int, int], str] = {}
-        for r_idx, row in enumerate(ws.iter_rows(values_only=True), start=1):
-            for c_idx, val in enumerate(row, start=1):
-                if val is not None and str(val).strip():
-                    grid[(r_idx-1, c_idx-1)] = str(val).strip()  # 0-based
-
         # Open Excel as ZIP and find DrawingML files
         z = _zipfile.ZipFile(xlsx_path, 'r')
 
@@ -77,33 +121,29 @@ def _v14_extract_shapes_to_mermaid(xlsx_path: str, ws, opts) -> Optional[str]:
         sheet_name = ws.title
 
         # 2. Find sheet ID from workbook.xml
+        # (iterparse: stop at the matching <sheet>/<Relationship> instead of building full trees)
         sheet_id = None
         try:
-            wb_xml = z.read('xl/workbook.xml').decode('utf-8')
-            wb_root = _ET.fromstring(wb_xml)
-            ns_wb = {'main': 'http://schemas.openxmlformats.org/spreadsheetml/2006/main',
-                     'r': 'http://schemas.openxmlformats.org/officeDocument/2006/relationships'}
-            sheets = wb_root.findall('.//main:sheet', ns_wb)
-            for sheet in sheets:
-                if sheet.get('name') == sheet_name:
+            r_id = None
+            for _, elem in _ET.iterparse(_io.BytesIO(z.read('xl/workbook.xml')), events=("end",)):
+                if elem.tag == _TAG_WB_SHEET and elem.get('name') == sheet_name:
                     # Get rId from relationship
-                    r_id = sheet.get('{http://schemas.openxmlformats.org/officeDocument/2006/relationships}id')
-                    if r_id:
-                        # Find sheet index from workbook.xml.rels
-                        wb_rels_xml = z.read('xl/_rels/workbook.xml.rels').decode('utf-8')
-                        wb_rels_root = _ET.fromstring(wb_rels_xml)
-                        ns_rel = {'r': 'http://schemas.openxmlformats.org/package/2006/relationships'}
-                        for rel in wb_rels_root.findall('.//r:Relationship', ns_rel):
-                            if rel.get('Id') == r_id:
-                                target = rel.get('Target')
-                                # Extract sheet number from target (e.g., "worksheets/sheet1.xml" -> "1")
-                                if 'sheet' in target:
-                                    # Find the number after "sheet" and before ".xml"
-                                    match = re.search(r'sheet(\d+)\.xml', target)
-                                    if match:
-                                        sheet_id = match.group(1)
-                                break
+                    r_id = elem.get(_ATTR_R_ID)
                     break
+                elem.clear()
+            if r_id:
+                # Find sheet index from workbook.xml.rels
+                for _, rel in _ET.iterparse(_io.BytesIO(z.read('xl/_rels/workbook.xml.rels')), events=("end",)):
+                    if rel.tag == _TAG_RELATIONSHIP and rel.get('Id') == r_id:
+                        target = rel.get('Target')
+                        # Extract sheet number from target (e.g., "worksheets/sheet1.xml" -> "1")
+                        if 'sheet' in target:
+                            # Find the number after "sheet" and before ".xml"
+                            match = re.search(r'sheet(\d+)\.xml', target)
+                            if match:
+                                sheet_id = match.group(1)
+                        break
+                    rel.clear()
         except Exception as e:
             warn(f"Failed to find sheet ID for '{sheet_name}': {e}")
 
@@ -155,22 +195,22 @@ def _v14_extract_shapes_to_mermaid(xlsx_path: str, ws, opts) -> Optional[str]:
             """
             texts = []
             # First try xdr:txBody (correct structure in Excel)
-            for txbody in sp.findall(".//xdr:txBody", _DRAWINGML_NS):
-                for p in txbody.findall(".//a:p", _DRAWINGML_NS):
+            for txbody in sp.iter(_TAG_XDR_TXBODY):
+                for p in txbody.iter(_TAG_P):
                     runs = []
-                    for r in p.findall(".//a:r", _DRAWINGML_NS):
-                        t = r.find("a:t", _DRAWINGML_NS)
+                    for r in p.iter(_TAG_R):
+                        t = r.find(_TAG_T)
                         if t is not None and t.text:
                             runs.append(t.text)
                     if runs:
                         texts.append("".join(runs))
             # Fallback: try a:txBody (for compatibility)
             if not texts:
-                for txbody in sp.findall(".//a:txBody", _DRAWINGML_NS):
-                    for p in txbody.findall(".//a:p", _DRAWINGML_NS):
+                for txbody in sp.iter(_TAG_A_TXBODY):
+                    for p in txbody.iter(_TAG_P):
                         runs = []
-                        for r in p.findall(".//a:r", _DRAWINGML_NS):
-                            t = r.find("a:t", _DRAWINGML_NS)
+                        for r in p.iter(_TAG_R):
+                            t = r.find(_TAG_T)
                             if t is not None and t.text:
                                 runs.append(t.text)
                         if runs:
@@ -180,23 +220,42 @@ def _v14_extract_shapes_to_mermaid(xlsx_path: str, ws, opts) -> Optional[str]:
         def cell_bbox(anc):
             def int_or_none(e):
                 return int(e.text) if e is not None and e.text and e.text.isdigit() else None
-            fr_c = anc.find(".//xdr:from/xdr:col", _DRAWINGML_NS)
-            fr_r = anc.find(".//xdr:from/xdr:row", _DRAWINGML_NS)
-            to_c = anc.find(".//xdr:to/xdr:col", _DRAWINGML_NS)
-            to_r = anc.find(".//xdr:to/xdr:row", _DRAWINGML_NS)
+            fr = _first_descendant(anc, _TAG_FROM)
+            to = _first_descendant(anc, _TAG_TO)
+            if fr is None or to is None:
+                return None
+            fr_c = fr.find(_TAG_COL)
+            fr_r = fr.find(_TAG_ROW)
+            to_c = to.find(_TAG_COL)
+            to_r = to.find(_TAG_ROW)
             if all(x is not None for x in (fr_c, fr_r, to_c, to_r)):
                 return [int_or_none(fr_r), int_or_none(fr_c), int_or_none(to_r), int_or_none(to_c)]
             return None
 
+        # Cell grid {(row, col): value} (0-based), built on first use.
+        # Shapes with their own txBody text never need it.
+        grid: Optional[Dict[Tuple[int, int], str]] = None
+
+        def get_grid() -> Dict[Tuple[int, int], str]:
+            nonlocal grid
+            if grid is None:
+                grid = {}
+                for r_idx, row in enumerate(ws.iter_rows(values_only=True)):
+                    for c_idx, val in enumerate(row):
+                        if val is not None and str(val).strip():
+                            grid[(r_idx, c_idx)] = str(val).strip()
+            return grid
+
         def text_from_bbox(bbox):
             if not bbox or None in bbox:
                 return ''
+            cells = get_grid()
             r1, c1, r2, c2 = bbox
             pad = 1
             texts = []
             for r in range(max(0, r1-pad), r2+pad+1):
                 for c in range(max(0, c1-pad), c2+pad+1):
-                    v = grid.get((r, c))
+                    v = cells.get((r, c))
                     if v:
                         texts.append(v)
             if texts:
@@ -207,15 +266,15 @@ def _v14_extract_shapes_to_mermaid(xlsx_path: str, ws, opts) -> Optional[str]:
             return ''
 
         # Scan anchors
-        anchors = root.findall(".//xdr:twoCellAnchor", _DRAWINGML_NS) + root.findall(".//xdr:oneCellAnchor", _DRAWINGML_NS)
+        anchors = list(root.iter(_TAG_TWO_CELL_ANCHOR)) + list(root.iter(_TAG_ONE_CELL_ANCHOR))
 
         for anc in anchors:
-            sp = anc.find(".//xdr:sp", _DRAWINGML_NS)
-            cxn = anc.find(".//xdr:cxnSp", _DRAWINGML_NS)
+            sp = _first_descendant(anc, _TAG_SP)
+            cxn = _first_descendant(anc, _TAG_CXNSP)
             bbox = cell_bbox(anc)
 
             if sp is not None:
-                cNvPr = sp.find(".//xdr:cNvPr", _DRAWINGML_NS)
+                cNvPr = _first_descendant(sp, _TAG_CNVPR)
                 _id = get_id(cNvPr)
                 name = cNvPr.get("name") if cNvPr is not None else None
 
@@ -227,7 +286,7 @@ def _v14_extract_shapes_to_mermaid(xlsx_path: str, ws, opts) -> Optional[str]:
                     text = name or ""
 
                 # 形状種類の判定
-                prstGeom = sp.find(".//a:prstGeom", _DRAWINGML_NS)
+                prstGeom = _first_descendant(sp, _TAG_PRSTGEOM)
                 prst = prstGeom.get("prst") if prstGeom is not None else None
                 shape_type = "process"  # デフォルト
                 if prst:
@@ -248,8 +307,8 @@ def _v14_extract_shapes_to_mermaid(xlsx_path: str, ws, opts) -> Optional[str]:
 
                 nodes.append({"id": _id, "name": name, "text": text, "bbox": bbox, "type": shape_type})
             elif cxn is not None:
-                st = cxn.find(".//a:stCxn", _DRAWINGML_NS)
-                ed = cxn.find(".//a:endCxn", _DRAWINGML_NS)
+                st = _first_descendant(cxn, _TAG_STCXN)
+                ed = _first_descendant(cxn, _TAG_ENDCXN)
                 st_id = f"s{st.get('id')}" if st is not None and st.get("id") else None
                 ed_id = f"s{ed.get('id')}" if ed is not None and ed.get("id") else None
                 if st_id and ed_id:
@@ -269,23 +328,9 @@ def _v14_extract_shapes_to_mermaid(xlsx_path: str, ws, opts) -> Optional[str]:
         direction = opts.get("mermaid_direction", "TD")
         node_id_policy = opts.get("mermaid_node_id_policy", "auto")
 
-        def escape_mermaid_text(text: str) -> str:
-            """Mermaid表示名の特殊文字をHTMLエンティティに変換"""
-            if not text:
-                return ""
-            # 主要な特殊文字をHTMLエンティティに変換
-            text = text.replace("[", "&#91;")
-            text = text.replace("]", "&#93;")
-            text = text.replace("{", "&#123;")
-            text = text.replace("}", "&#125;")
-            text = text.replace("|", "&#124;")
-            text = text.replace('"', "&quot;")
-            text = text.replace("'", "&#39;")
-            return text
-
         def format_node(nid: str, display: str, shape_type: str) -> str:
             """シェイプ種類に応じたMermaidノード形式を生成"""
-            display_escaped = escape_mermaid_text(display)
+            display_escaped = _v14_escape_mermaid_text(display)
             if shape_type == "decision":
                 return f'  {nid}{{"{display_escaped}"}}'
             elif shape_type == "terminator":
@@ -467,9 +512,9 @@ def build_mermaid(md_rows, opts, colmap):
     node_id_policy = opts.get("mermaid_node_id_policy", "auto")
     group_behavior = opts.get("mermaid_group_column_behavior", "subgraph")
 
-    # Prepare sets
+    # Prepare sets (edges: dict as an insertion-ordered set, emitted in row order)
     nodes = {}
-    edges = set()
+    edges = {}
     groups = {}
     header = md_rows[0]
     data_rows = md_rows[1:] if len(md_rows)>1 else []
@@ -507,7 +552,7 @@ def build_mermaid(md_rows, opts, colmap):
         if opts.get("mermaid_dedupe_edges", True):
             if key in edges:
                 continue
-        edges.add(key)
+        edges[key] = None
         g = get_val(row, colmap.get("group"))
         if g and group_behavior == "subgraph":
             groups.setdefault(g, set()).update([fid, tid])
@@ -548,7 +593,7 @@ def build_mermaid(md_rows, opts, colmap):
         lines.append(f'  {nid}["{str(k)}"]')
 
     # edges
-    for (a,b,lab) in sorted(edges):
+    for (a,b,lab) in edges:
         if lab:
             lines.append(f'  {a} -->|{lab}| {b}')
         else:
@@ -5,6 +5,12 @@
 """
 
 import sys
+from typing import List, Optional, Set
+
+# Messages already emitted by warn_once in this process
+_warned_once: Set[str] = set()
+# When not None, warn_once collects messages here instead of printing (worker processes)
+_deferred_once: Optional[List[str]] = None
 
 
 def warn(msg: str) -> None:
@@ -13,3 +19,32 @@ def warn(msg: str) -> None:
 
 def info(msg: str) -> None:
     print(f"[INFO] {msg}", file=sys.stderr)
+
+
+def warn_once(msg: str) -> None:
+    """Warn only the first time msg is seen in this process."""
+    if _deferred_once is not None:
+        if msg not in _deferred_once:
+            _deferred_once.append(msg)
+        return
+    if msg not in _warned_once:
+        _warned_once.add(msg)
+        warn(msg)
+
+
+def defer_warn_once() -> None:
+    """Collect warn_once messages instead of printing them.
+
+    Used in worker processes, whose messages are handed back to the parent
+    with take_deferred_warn_once() and replayed there through warn_once.
+    """
+    global _deferred_once
+    _deferred_once = []
+
+
+def take_deferred_warn_once() -> List[str]:
+    """Return and clear the messages collected since defer_warn_once()."""
+    msgs = list(_deferred_once or ())
+    if _deferred_once:
+        _deferred_once.clear()
+    return msgs
@@ -4,47 +4,253 @@
 処理フロー全体の制御、各モジュールの呼び出し順序管理を担当する。
 """
 
+import io
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Tuple, Optional
+from typing import Dict, Tuple, Optional
 
 from . import __version__ as VERSION
-from .output import warn, info
+from .output import warn, info, warn_once, defer_warn_once, take_deferred_warn_once
 from .workbook_loader import load_workbook_safe, get_print_areas
 from .mermaid_generator import _v14_extract_shapes_to_mermaid
-from .table_detection import build_merged_lookup, grid_to_tables, union_rects
-from .table_extraction import extract_table, dispatch_table_output
-from .table_formatting import make_markdown_table
+from .table_detection import build_merged_lookup, grid_to_tables, merged_range_bounds, union_rects
+from .table_extraction import build_merged_by_top_left, extract_table, dispatch_table_output
 from .image_extraction import extract_images_from_sheet
 from .csv_export import coords_to_excel_range, write_csv_markdown, extract_print_area_for_csv
 
-def run(input_path: str, output_path: Optional[str], args):
-    """Excel→Markdown変換のメイン処理を実行する。"""
-    # ワークブック読み込み
-    wb = load_workbook_safe(input_path, read_only=args.read_only)
-    sheets = wb.sheetnames
+# プロセスプールのワーカーごとに開いたワークブック
+_worker_wb = None
 
-    split_by_sheet = getattr(args, "split_by_sheet", False)
+# 出力中で変化しない見出し・定型行
+_VERSION_LINE = f"- 仕様バージョン: {VERSION}"
+_TABLE_HEADING_FMT = "### Table %d"
 
-    # split_by_sheetモード: シートごとにMarkdown行と脚注を管理
-    if split_by_sheet:
-        sheet_md_dict = {}
-        sheet_footnotes_dict = {}
-    else:
-        md_lines = []
-        md_lines.append(f"# 変換結果: {Path(input_path).name}")
-        md_lines.append("")
-        md_lines.append(f"- 仕様バージョン: {VERSION}")
-        md_lines.append(f"- シート数: {len(sheets)}")
-        md_lines.append(f"- シート一覧: {', '.join(sheets)}")
-        md_lines.append("\n---\n")
+# dispatch_table_output の形式別出力（"table" は整形済みの表に切り詰め注記を付ける）
+_FORMAT_HANDLERS = {
+    "text": lambda out: out + "\n",
+    "nested": lambda out: out + "\n",
+    "code": lambda out: out + "\n",
+    "mermaid": lambda out: out + "\n",
+    "empty": lambda out: "\n",
+}
 
-    # 脚注管理
-    footnotes: List[Tuple[int,str]] = []
+# ファイル名に使えない文字（英数字・空白・'-'・'_' 以外）
+_UNSAFE_FILENAME_CHARS = re.compile(r"[^\w \-]")
+
+
+def _safe_sheet_filename(sname: str) -> str:
+    """シート名をファイル名用にサニタイズする。"""
+    return _UNSAFE_FILENAME_CHARS.sub("_", sname)
+
+
+def _init_sheet_worker(input_path: str, read_only: bool):
+    """ワーカープロセス初期化: ワークブックを1度だけ開いて保持する。"""
+    global _worker_wb
+    _worker_wb = load_workbook_safe(input_path, read_only=read_only)
+    # 1度だけの警告はプロセスごとに重複するため、親プロセスへ返して出力する
+    defer_warn_once()
+
+
+def _process_sheet_in_worker(task):
+    """ワーカープロセス側で1シート分の変換を実行する。
+
+    Returns:
+        (_process_sheet の結果, このシートで発生した warn_once のメッセージ)
+    """
+    return _process_sheet(_worker_wb, *task), take_deferred_warn_once()
+
+
+def _resolve_workers(requested: int, sheet_count: int) -> int:
+    """並列ワーカー数を決定する（0 は自動: min(シート数, CPU数)）。"""
+    if requested is None or requested < 0:
+        return 1
+    if requested == 0:
+        requested = os.cpu_count() or 1
+    return max(1, min(requested, sheet_count))
+
+
+def _process_sheet(wb, sheet_index: int, sname: str, input_path: str, opts, split_by_sheet: bool,
+                   csv_output_dir: str, csv_basename: str):
+    """1シート分の変換を実行する。
+
+    シート間で状態を共有しないため、ワーカープロセスからも呼び出せる。
+
+    Returns:
+        (シートのMarkdown文字列, 脚注リスト, CSV Markdownデータ or None, 印刷領域の有無)
+    """
+    # 脚注は (番号, テキスト) をキーとする挿入順の集合として保持（追加時に重複排除）
+    footnotes: Dict[Tuple[int,str], None] = {}
     global_footnote_start = 1
-    sheet_counter = 0
+    csv_entry = None
 
-    # オプション辞書の構築
-    opts = {
+    # シートごとのMarkdown行を初期化
+    current_md_lines = []
+    if split_by_sheet:
+        current_md_lines.append(f"# {sname}")
+        current_md_lines.append("")
+        current_md_lines.append(_VERSION_LINE)
+        current_md_lines.append(f"- 元ファイル: {Path(input_path).name}")
+        current_md_lines.append("\n---\n")
+
+    if opts["max_sheet_count"] and sheet_index > opts["max_sheet_count"]:
+        current_md_lines.append(f"## {sname}\n（シート数上限によりスキップ）\n\n---\n")
+        return "\n".join(current_md_lines), footnotes, csv_entry, False
+
+    # 上限内のシートのみワークシートを取得する
+    ws = wb[sname]
+
+    # 保護状態チェック
+    if getattr(getattr(ws, "protection", None), "sheet", False):
+        info(f"Sheet '{sname}' is protected (read-only); proceeding with read-only extraction.")
+
+    if not split_by_sheet:
+        current_md_lines.append(f"## {sname}\n")
+
+    # shapes検出モード時のMermaid生成
+    shapes_mermaid = None
+    if opts.get("mermaid_enabled", False) and opts.get("mermaid_detect_mode") == "shapes":
+        shapes_mermaid = _v14_extract_shapes_to_mermaid(input_path, ws, opts)
+        if shapes_mermaid:
+            current_md_lines.append(shapes_mermaid + "\n")
+            current_md_lines.append("\n---\n")
+
+    # 印刷領域取得
+    areas = get_print_areas(ws, opts["no_print_area_mode"])
+    if not areas:
+        current_md_lines.append("（テーブルなし）\n\n---\n")
+        return "\n".join(current_md_lines), footnotes, csv_entry, False
+
+    # 矩形和集合計算
+    unioned = union_rects(areas)
+
+    table_id = 0
+
+    # CSV Markdown出力時は画像抽出を矩形ループの前に1度だけ行う
+    csv_enabled = opts.get("csv_markdown_enabled", True)
+    cell_to_image = {}
+    if csv_enabled and opts.get("image_extraction", True):
+        cell_to_image = extract_images_from_sheet(ws, Path(csv_output_dir), sname, csv_basename, opts, xlsx_path=input_path)
+
+    # 画像位置の外接矩形（矩形ごとの範囲拡張で使うためシート単位で1度だけ求める）
+    image_bounds = None
+    if cell_to_image:
+        img_rows, img_cols = zip(*cell_to_image)
+        image_bounds = (min(img_rows), min(img_cols), max(img_rows), max(img_cols))
+
+    # 結合セル範囲はシート単位で1度だけ列挙し、範囲ごとの結合セルマップはMarkdown/CSVで共有する
+    merged_ranges = merged_range_bounds(ws)
+    merged_lookup_by_area = {}
+    merged_by_tl = build_merged_by_top_left(ws, merged_ranges)
+
+    # 矩形・テーブル単位ループ（Markdown出力とCSVデータ収集を1パスで行う）
+    for union_area in unioned:
+        # 結合セルマップ作成
+        merged_lookup = merged_lookup_by_area.get(union_area)
+        if merged_lookup is None:
+            merged_lookup = build_merged_lookup(ws, union_area, merged_ranges)
+            merged_lookup_by_area[union_area] = merged_lookup
+
+        # CSVデータ収集
+        if csv_enabled:
+            csv_area = union_area
+            # 画像位置を含むように範囲を拡張
+            if image_bounds:
+                min_r, min_c, max_r, max_c = csv_area
+                img_min_r, img_min_c, img_max_r, img_max_c = image_bounds
+                csv_area = (min(min_r, img_min_r), min(min_c, img_min_c),
+                            max(max_r, img_max_r), max(max_c, img_max_c))
+
+            # 画像位置で範囲が拡張された場合のみ再計算
+            csv_merged_lookup = merged_lookup_by_area.get(csv_area)
+            if csv_merged_lookup is None:
+                csv_merged_lookup = build_merged_lookup(ws, csv_area, merged_ranges)
+                merged_lookup_by_area[csv_area] = csv_merged_lookup
+            try:
+                csv_rows = extract_print_area_for_csv(ws, csv_area, opts, csv_merged_lookup, cell_to_image)
+                if csv_rows:
+                    excel_range = coords_to_excel_range(*csv_area)
+                    csv_entry = {
+                        "rows": csv_rows,
+                        "range": excel_range,
+                        "area": csv_area,
+                        "mermaid": None,
+                    }
+            except Exception as e:
+                warn(f"CSV data extraction failed for sheet '{sname}': {e}")
+
+        # テーブル分割検出
+        tables = grid_to_tables(ws, union_area, hidden_policy=opts["hidden_policy"], opts=opts,
+                                merged_lookup=merged_lookup, merged_ranges=merged_ranges)
+        if not tables:
+            continue
+
+        # 各テーブル単位ループ
+        for tbl in tables:
+            table_id += 1
+
+            # テーブル抽出
+            md_rows, note_refs, truncated, table_title = extract_table(ws, tbl, opts, footnotes, global_footnote_start, merged_lookup, print_area=union_area, merged_by_tl=merged_by_tl)
+
+            if table_title:
+                current_md_lines.append(f"### {table_title}")
+            else:
+                current_md_lines.append(_TABLE_HEADING_FMT % table_id)
+            for (n, txt) in note_refs:
+                footnotes[(n, txt)] = None
+
+            if not md_rows:
+                current_md_lines.append("（テーブルなし）\n")
+                continue
+
+            # テーブル形式判定・出力
+            format_type, formatted_output = dispatch_table_output(ws, tbl, md_rows, opts, merged_lookup, xlsx_path=input_path)
+
+            handler = _FORMAT_HANDLERS.get(format_type)
+            if handler is not None:
+                current_md_lines.append(handler(formatted_output))
+            else:
+                # 通常テーブル形式（dispatch_table_output が同じ設定で生成済みの表をそのまま使う）
+                current_md_lines.append(formatted_output + "\n")
+                if truncated:
+                    current_md_lines.append("_※ このテーブルは max_cells_per_table 制限により途中で打ち切られました。_\n")
+
+        current_md_lines.append("\n---\n")
+
+    # CSV Markdown用Mermaid抽出
+    if csv_enabled and opts.get("mermaid_enabled", False) and csv_entry is not None:
+        detect_mode = opts.get("mermaid_detect_mode", "shapes")
+        if detect_mode == "shapes":
+            # シート冒頭で抽出済みの結果を再利用（DrawingMLの再解析を避ける）
+            if shapes_mermaid:
+                csv_entry["mermaid"] = shapes_mermaid
+        elif detect_mode in ("column_headers", "heuristic"):
+            # CSV Markdownではcolumn_headers/heuristicモード非対応（テーブル分割なしのため）
+            warn(f"mermaid_detect_mode='{detect_mode}' is not supported for CSV markdown output (only 'shapes' is supported). Mermaid output will be skipped for sheet '{sname}'.")
+
+    # split_by_sheetモード: シートごとの脚注を出力
+    if split_by_sheet:
+        if footnotes and opts["hyperlink_mode"] in ("footnote", "both"):
+            footnotes_sorted = sorted(footnotes, key=lambda x: x[0])
+            current_md_lines.append("\n")
+            for idx, txt in footnotes_sorted:
+                current_md_lines.append(f"[^{idx}]: {txt}")
+
+    return "\n".join(current_md_lines), footnotes, csv_entry, True
+
+
+def _parse_mermaid_columns(spec: str):
+    """--mermaid-columns（From,To,Label,Group,Note）を列名マッピングに変換する。"""
+    parts = [p.strip() for p in spec.split(",")]
+    defaults = ("From", "To", "Label", None, None)
+    keys = ("from", "to", "label", "group", "note")
+    return {k: (parts[i] if i < len(parts) else defaults[i]) for i, k in enumerate(keys)}
+
+
+def _build_opts(args):
+    """argparseの結果から変換オプション辞書を構築する。"""
+    return {
         "no_print_area_mode": args.no_print_area_mode,
         "value_mode": args.value_mode,
         "merge_policy": args.merge_policy,
@@ -76,13 +282,7 @@ def run(input_path: str, output_path: Optional[str], args):
         "mermaid_dedupe_edges": getattr(args, "mermaid_dedupe_edges", True),
         "mermaid_node_id_policy": getattr(args, "mermaid_node_id_policy", "auto"),
         "mermaid_group_column_behavior": getattr(args, "mermaid_group_column_behavior", "subgraph"),
-        "mermaid_columns": (lambda s: {
-            "from": (s.split(",")[0].strip() if len(s.split(","))>0 else "From"),
-            "to": (s.split(",")[1].strip() if len(s.split(","))>1 else "To"),
-            "label": (s.split(",")[2].strip() if len(s.split(","))>2 else "Label"),
-            "group": (s.split(",")[3].strip() if len(s.split(","))>3 else None),
-            "note": (s.split(",")[4].strip() if len(s.split(","))>4 else None),
-        })(args.mermaid_columns),
+        "mermaid_columns": _parse_mermaid_columns(args.mermaid_columns),
         "mermaid_heuristic_min_rows": args.mermaid_heuristic_min_rows,
         "mermaid_heuristic_arrow_ratio": args.mermaid_heuristic_arrow_ratio,
         "mermaid_heuristic_len_median_ratio_min": args.mermaid_heuristic_len_median_ratio_min,
@@ -104,187 +304,104 @@ def run(input_path: str, output_path: Optional[str], args):
         "image_extraction": getattr(args, "image_extraction", True),
     }
 
-    # CSV Markdown出力の準備
-    csv_output_dir = opts.get("csv_output_dir") or str(Path(input_path).parent)
-    csv_basename = Path(input_path).stem
-    csv_markdown_data = {}
-
-    # シート単位ループ
-    for sname in sheets:
-        sheet_counter += 1
-        ws = wb[sname]
-
-        # 保護状態チェック
-        if getattr(getattr(ws, "protection", None), "sheet", False):
-            info(f"Sheet '{sname}' is protected (read-only); proceeding with read-only extraction.")
-
-        # シートごとのMarkdown行を初期化
-        if split_by_sheet:
-            current_md_lines = []
-            current_md_lines.append(f"# {sname}")
-            current_md_lines.append("")
-            current_md_lines.append(f"- 仕様バージョン: {VERSION}")
-            current_md_lines.append(f"- 元ファイル: {Path(input_path).name}")
-            current_md_lines.append("\n---\n")
-            sheet_md_dict[sname] = current_md_lines
-            sheet_footnotes_dict[sname] = []
-            # split_by_sheetモードではシート単位で脚注を独立管理
-            if opts["footnote_scope"] == "book":
-                footnotes = []
-                global_footnote_start = 1
-        else:
-            current_md_lines = md_lines
-
-        if opts["max_sheet_count"] and sheet_counter > opts["max_sheet_count"]:
-            current_md_lines.append(f"## {sname}\n（シート数上限によりスキップ）\n\n---\n")
-            continue
-
-        if not split_by_sheet:
-            current_md_lines.append(f"## {sname}\n")
-
-        # shapes検出モード時のMermaid生成
-        shapes_mermaid = None
-        if opts.get("mermaid_enabled", False) and opts.get("mermaid_detect_mode") == "shapes":
-            shapes_mermaid = _v14_extract_shapes_to_mermaid(input_path, ws, opts)
-            if shapes_mermaid:
-                current_md_lines.append(shapes_mermaid + "\n")
-                current_md_lines.append("\n---\n")
-
-        # 印刷領域取得
-        areas = get_print_areas(ws, opts["no_print_area_mode"])
-        if not areas:
-            current_md_lines.append("（テーブルなし）\n\n---\n")
-            continue
 
-        # 矩形和集合計算
-        unioned = union_rects(areas)
-
-        # 脚注スコープ処理
-        if opts["footnote_scope"] == "sheet":
-            footnotes = []
-            global_footnote_start = 1
-
-        table_id = 0
+def run(input_path: str, output_path: Optional[str], args):
+    """Excel→Markdown変換のメイン処理を実行する。"""
+    # ワークブック読み込み
+    wb = load_workbook_safe(input_path, read_only=args.read_only)
+    sheets = wb.sheetnames
 
-        # 矩形・テーブル単位ループ
-        for union_area in unioned:
-            # 結合セルマップ作成
-            merged_lookup = build_merged_lookup(ws, union_area)
+    split_by_sheet = getattr(args, "split_by_sheet", False)
 
-            # テーブル分割検出
-            tables = grid_to_tables(ws, union_area, hidden_policy=opts["hidden_policy"], opts=opts)
-            if not tables:
-                continue
+    # split_by_sheetモード: シートごとにMarkdownと脚注を管理
+    # 通常モード: 1つのバッファへシート順に書き込む（ブロック間は改行1つで連結）
+    if split_by_sheet:
+        sheet_footnotes_dict = {}
+    else:
+        md_buf = io.StringIO()
+        md_buf.write("\n".join([
+            f"# 変換結果: {Path(input_path).name}",
+            "",
+            _VERSION_LINE,
+            f"- シート数: {len(sheets)}",
+            f"- シート一覧: {', '.join(sheets)}",
+            "\n---\n",
+        ]))
 
-            # 各テーブル単位ループ
-            for tbl in tables:
-                table_id += 1
+    # 脚注管理
+    footnotes: Dict[Tuple[int,str], None] = {}
 
-                # テーブル抽出
-                md_rows, note_refs, truncated, table_title = extract_table(ws, tbl, opts, footnotes, global_footnote_start, merged_lookup, print_area=union_area)
+    # オプション辞書の構築
+    opts = _build_opts(args)
 
-                if table_title:
-                    current_md_lines.append(f"### {table_title}")
-                else:
-                    current_md_lines.append(f"### Table {table_id}")
-                for (n, txt) in note_refs:
-                    footnotes.append((n, txt))
-
-                if not md_rows:
-                    current_md_lines.append("（テーブルなし）\n")
-                    continue
-
-                # テーブル形式判定・出力
-                format_type, formatted_output = dispatch_table_output(ws, tbl, md_rows, opts, merged_lookup, xlsx_path=input_path)
-
-                if format_type == "text":
-                    current_md_lines.append(formatted_output + "\n")
-                elif format_type == "nested":
-                    current_md_lines.append(formatted_output + "\n")
-                elif format_type == "code":
-                    current_md_lines.append(formatted_output + "\n")
-                elif format_type == "mermaid":
-                    current_md_lines.append(formatted_output + "\n")
-                elif format_type == "empty":
-                    current_md_lines.append("\n")
-                else:
-                    # 通常テーブル形式
-                    hdr = opts.get("header_detection", True)
-                    table_md = make_markdown_table(
-                        md_rows,
-                        header_detection=hdr,
-                        align_detect=opts["align_detection"],
-                        align_threshold=opts["numbers_right_threshold"],
-                    )
-                    current_md_lines.append(table_md + "\n")
-                    if truncated:
-                        current_md_lines.append("_※ このテーブルは max_cells_per_table 制限により途中で打ち切られました。_\n")
+    # CSV Markdown出力の準備
+    csv_output_dir = opts.get("csv_output_dir") or str(Path(input_path).parent)
+    csv_basename = Path(input_path).stem
+    csv_markdown_data = {}
 
-            current_md_lines.append("\n---\n")
+    # シート単位処理（--workers > 1 の場合はプロセスプールで並列実行）
+    tasks = [
+        (sheet_index, sname, input_path, opts, split_by_sheet, csv_output_dir, csv_basename)
+        for sheet_index, sname in enumerate(sheets, start=1)
+    ]
+    workers = _resolve_workers(getattr(args, "workers", 1), len(sheets))
+    if workers > 1:
+        # openpyxlのワークシートはpickleできないため、各ワーカーでブックを開き直す
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_sheet_worker,
+                                 initargs=(input_path, args.read_only)) as executor:
+            chunksize = max(1, len(tasks) // (workers * 4))
+            results = []
+            for result, once_msgs in executor.map(_process_sheet_in_worker, tasks, chunksize=chunksize):
+                # シート順に再出力し、ワーカー間の重複は親プロセスの warn_once で除く
+                for msg in once_msgs:
+                    warn_once(msg)
+                results.append(result)
+    else:
+        results = (_process_sheet(wb, *task) for task in tasks)
 
-        # CSV Markdown出力処理
-        if opts.get("csv_markdown_enabled", True):
-            # 画像抽出
-            cell_to_image = {}
-            if opts.get("image_extraction", True):
-                cell_to_image = extract_images_from_sheet(ws, Path(csv_output_dir), sname, csv_basename, opts, xlsx_path=input_path)
-
-            # CSVデータ収集
-            for union_area in unioned:
-                # 画像位置を含むように範囲を拡張
-                if cell_to_image:
-                    min_r, min_c, max_r, max_c = union_area
-                    for (img_row, img_col) in cell_to_image.keys():
-                        min_r = min(min_r, img_row)
-                        min_c = min(min_c, img_col)
-                        max_r = max(max_r, img_row)
-                        max_c = max(max_c, img_col)
-                    union_area = (min_r, min_c, max_r, max_c)
-
-                merged_lookup = build_merged_lookup(ws, union_area)
-                try:
-                    csv_rows = extract_print_area_for_csv(ws, union_area, opts, merged_lookup, cell_to_image)
-                    if csv_rows:
-                        excel_range = coords_to_excel_range(*union_area)
-                        csv_markdown_data[sname] = {
-                            "rows": csv_rows,
-                            "range": excel_range,
-                            "area": union_area,
-                            "mermaid": None,
-                        }
-                except Exception as e:
-                    warn(f"CSV data extraction failed for sheet '{sname}': {e}")
-
-            # CSV Markdown用Mermaid抽出
-            if opts.get("mermaid_enabled", False) and sname in csv_markdown_data:
-                detect_mode = opts.get("mermaid_detect_mode", "shapes")
-                if detect_mode == "shapes":
-                    try:
-                        csv_mermaid = _v14_extract_shapes_to_mermaid(input_path, ws, opts)
-                        if csv_mermaid:
-                            csv_markdown_data[sname]["mermaid"] = csv_mermaid
-                    except Exception as e:
-                        warn(f"Mermaid extraction for CSV markdown failed for sheet '{sname}': {e}")
-                elif detect_mode in ("column_headers", "heuristic"):
-                    # CSV Markdownではcolumn_headers/heuristicモード非対応（テーブル分割なしのため）
-                    warn(f"mermaid_detect_mode='{detect_mode}' is not supported for CSV markdown output (only 'shapes' is supported). Mermaid output will be skipped for sheet '{sname}'.")
-
-        # split_by_sheetモード: シートごとの脚注を保存・出力
-        if split_by_sheet:
-            sheet_footnotes_dict[sname] = list(footnotes)
-            if footnotes and opts["hyperlink_mode"] in ("footnote", "both"):
-                footnotes_sorted = sorted(set(footnotes), key=lambda x: x[0])
-                current_md_lines.append("\n")
-                for idx, txt in footnotes_sorted:
-                    current_md_lines.append(f"[^{idx}]: {txt}")
+    # 分割Markdown出力: 書き込みをスレッドへ投げ、次シートの変換と重ねる
+    md_write_pool = None
+    md_write_futures = []
+    if split_by_sheet and not opts.get("csv_markdown_enabled", True):
+        output_dir = Path(output_path).parent if output_path else Path(input_path).parent
+        output_basename = Path(output_path).stem if output_path else Path(input_path).stem
+        md_write_pool = ThreadPoolExecutor(max_workers=2)
+
+    # 書き込みプールはマージ処理全体を覆う（シート変換や書き込みの失敗時は未着手の書き込みを取り消す）
+    try:
+        # シート順に結果をマージ
+        for sname, (sheet_md, sheet_footnotes, csv_entry, has_areas) in zip(sheets, results):
+            if split_by_sheet:
+                sheet_footnotes_dict[sname] = sheet_footnotes
+                if md_write_pool is not None:
+                    safe_sheet_name = _safe_sheet_filename(sname)
+                    sheet_output_path = output_dir / f"{output_basename}_{safe_sheet_name}.md"
+                    future = md_write_pool.submit(Path(sheet_output_path).write_text, sheet_md, encoding="utf-8")
+                    md_write_futures.append((str(sheet_output_path), future))
+            else:
+                md_buf.write("\n")
+                md_buf.write(sheet_md)
+                # 脚注スコープ処理
+                if has_areas and opts["footnote_scope"] == "sheet":
+                    footnotes = {}
+                footnotes.update(sheet_footnotes)
+            if csv_entry is not None:
+                csv_markdown_data[sname] = csv_entry
+
+        # 投入済みの書き込み完了を待つ（書き込み失敗はここで送出）
+        for _, future in md_write_futures:
+            future.result()
+    finally:
+        if md_write_pool is not None:
+            md_write_pool.shutdown(wait=True, cancel_futures=True)
 
     # 通常モード: ドキュメント末尾に脚注を追加
     if not split_by_sheet:
         if footnotes and opts["hyperlink_mode"] in ("footnote", "both"):
-            footnotes_sorted = sorted(set(footnotes), key=lambda x: x[0])
-            md_lines.append("\n")
+            footnotes_sorted = sorted(footnotes, key=lambda x: x[0])
+            md_buf.write("\n\n")
             for idx, txt in footnotes_sorted:
-                md_lines.append(f"[^{idx}]: {txt}")
+                md_buf.write(f"\n[^{idx}]: {txt}")
 
     # 出力ファイル書き込み
     if opts.get("csv_markdown_enabled", True):
@@ -300,8 +417,7 @@ def run(input_path: str, output_path: Optional[str], args):
                     for sname in sheets:
                         if sname not in csv_markdown_data:
                             continue
-                        # シート名をファイル名用にサニタイズ
-                        safe_sheet_name = "".join(c if c.isalnum() or c in (' ', '-', '_') else '_' for c in sname)
+                        safe_sheet_name = _safe_sheet_filename(sname)
                         single_sheet_data = {sname: csv_markdown_data[sname]}
                         csv_file = write_csv_markdown(
                             wb, single_sheet_data,
@@ -325,24 +441,12 @@ def run(input_path: str, output_path: Optional[str], args):
 
     # 通常Markdown出力モード
     if split_by_sheet:
-        # シートごと分割出力
-        output_dir = Path(output_path).parent if output_path else Path(input_path).parent
-        output_basename = Path(output_path).stem if output_path else Path(input_path).stem
-        output_files = []
-
-        for sname in sheets:
-            if sname not in sheet_md_dict:
-                continue
-            # シート名をファイル名用にサニタイズ
-            safe_sheet_name = "".join(c if c.isalnum() or c in (' ', '-', '_') else '_' for c in sname)
-            sheet_output_path = output_dir / f"{output_basename}_{safe_sheet_name}.md"
-            Path(sheet_output_path).write_text("\n".join(sheet_md_dict[sname]), encoding="utf-8")
-            output_files.append(str(sheet_output_path))
-
+        # シートごと分割出力（書き込みはマージ処理中に完了済み）
+        output_files = [sheet_output_path for sheet_output_path, _ in md_write_futures]
         return "\n".join([f"シートごとに分割して出力しました:"] + output_files)
     else:
         # 通常モード: 単一ファイルに出力
         if not output_path:
             output_path = str(Path(input_path).with_suffix(".md"))
-        Path(output_path).write_text("\n".join(md_lines), encoding="utf-8")
+        Path(output_path).write_text(md_buf.getvalue(), encoding="utf-8")
         return output_path
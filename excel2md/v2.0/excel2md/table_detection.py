@@ -4,9 +4,9 @@
 仕様書参照: §4.2 テーブル検出フロー、§5.4 セル空性の判定
 """
 
-from typing import List, Tuple, Set, Dict
+from typing import List, Optional, Tuple, Set, Dict
 
-from .cell_utils import cell_is_empty, cell_display_value, no_fill
+from .cell_utils import cell_display_value, is_whitespace_only, no_fill
 from .output import warn
 
 def collect_hidden(ws):
@@ -21,15 +21,50 @@ def collect_hidden(ws):
                 pass
     return hidden_rows, hidden_cols_idx
 
-def build_nonempty_grid(ws, area, hidden_policy="ignore", opts=None) -> Tuple[List[List[int]], int, int, int, int]:
+def _iter_area_cells(ws, area):
+    """Yield the cells of each area row, with None for coordinates that hold no cell.
+
+    Normal worksheets are probed through their cell dict, so missing cells are
+    neither constructed nor added to the sheet as ws.cell()/iter_rows would do.
+    Read-only worksheets have no such dict and are streamed with iter_rows.
+    """
+    r0, c0, r1, c1 = area
+    cells = getattr(ws, "_cells", None)
+    if cells is None:
+        yield from ws.iter_rows(min_row=r0, max_row=r1, min_col=c0, max_col=c1)
+        return
+    get = cells.get
+    cols = range(c0, c1 + 1)
+    for R in range(r0, r1 + 1):
+        yield [get((R, C)) for C in cols]
+
+def merged_range_bounds(ws) -> List[Tuple[int,int,int,int]]:
+    """List the sheet's merged ranges once as (min_row, min_col, max_row, max_col) tuples.
+
+    Plain tuples unpack far faster than CellRange attributes, so callers that
+    filter the ranges per area share this list instead of ws.merged_cells.
+    """
+    bounds = []
+    for rng in getattr(ws, "merged_cells", None) or []:
+        try:
+            bounds.append((rng.min_row, rng.min_col, rng.max_row, rng.max_col))
+        except Exception:
+            continue
+    return bounds
+
+def _scan_area(ws, area, hidden_policy="ignore", opts=None, merged_ranges=None):
+    """Read every cell of the area once and derive both per-cell emptiness tests.
+
+    Returns (grid, content): grid is the non-empty grid of build_nonempty_grid, and
+    content[r] is a bitmask whose bit c is set when the cell has non-blank text or
+    a non-white fill (the test grid_to_tables uses to find separating empty rows/columns).
+    """
     r0, c0, r1, c1 = area
-    rows = r1 - r0 + 1
     cols = c1 - c0 + 1
-    grid = [[0]*cols for _ in range(rows)]
-    merged_blocks = list(ws.merged_cells.ranges) if getattr(ws, "merged_cells", None) else []
+    if merged_ranges is None:
+        merged_ranges = merged_range_bounds(ws)
     merged_coords = []
-    for rng in merged_blocks:
-        min_row, min_col, max_row, max_col = rng.min_row, rng.min_col, rng.max_row, rng.max_col
+    for min_row, min_col, max_row, max_col in merged_ranges:
         if max_row < r0 or min_row > r1 or max_col < c0 or min_col > c1:
             continue
         if min_row < r0 or min_col < c0:
@@ -37,136 +72,218 @@ def build_nonempty_grid(ws, area, hidden_policy="ignore", opts=None) -> Tuple[Li
         # Only include the part of merged cell that is within print area
         merged_coords.append((max(r0, min_row), max(c0, min_col), min(r1, max_row), min(c1, max_col)))
 
-    hidden_rows, hidden_cols_idx = collect_hidden(ws)
+    # filled follows cell_is_empty (hidden cells included); content follows the
+    # text/fill check used for empty-row/column detection.
+    # Per-cell helpers and the fill policy are bound to locals once per area
+    fill_policy = opts.get("readonly_fill_policy", "assume_no_fill")
+    _display = cell_display_value
+    _no_fill = no_fill
+    _blank = is_whitespace_only
+    filled = []
+    content = []
+    for row_cells in _iter_area_cells(ws, area):
+        filled_row = []
+        append = filled_row.append
+        content_bits = 0
+        for cc, cell in enumerate(row_cells):
+            if cell is None:
+                # Never-written coordinate: no value and no fill
+                append(0)
+                continue
+            # A cell without a value displays as "" (often a styled blank), so
+            # only its fill needs checking
+            text = "" if cell.value is None else _display(cell, opts)
+            nofill = _no_fill(cell, fill_policy)
+            append(0 if (text == "" or _blank(text)) and nofill else 1)
+            if (text and text.strip()) or not nofill:
+                content_bits |= 1 << cc
+        filled.append(filled_row)
+        content.append(content_bits)
 
-    for rr in range(rows):
-        for cc in range(cols):
-            R = r0 + rr
-            C = c0 + cc
-            if hidden_policy == "exclude" and (R in hidden_rows or C in hidden_cols_idx):
+    # grid starts as filled; it is copied only when hidden cells or merged blocks
+    # change it, because the merged check below reads the unmodified values
+    if hidden_policy == "exclude" or merged_coords:
+        grid = [row[:] for row in filled]
+    else:
+        grid = filled
+    if hidden_policy == "exclude":
+        hidden_rows, hidden_cols_idx = collect_hidden(ws)
+        skip_cols = [C - c0 for C in hidden_cols_idx if c0 <= C <= c1]
+        for rr, grid_row in enumerate(grid):
+            if (r0 + rr) in hidden_rows:
+                grid[rr] = [0]*cols
                 continue
-            cell = ws.cell(row=R, column=C)
-            empty = cell_is_empty(cell, opts)
-            grid[rr][cc] = 0 if empty else 1
+            for cc in skip_cols:
+                grid_row[cc] = 0
 
-    # merged influence
+    # merged influence: the block is clipped to the area, and hidden cells still count
     for mr0, mc0, mr1, mc1 in merged_coords:
-        found_nonempty = False
-        for R in range(mr0, mr1+1):
-            for C in range(mc0, mc1+1):
-                if R < r0 or R > r1 or C < c0 or C > c1:
-                    continue
-                cell = ws.cell(row=R, column=C)
-                if not cell_is_empty(cell, opts):
-                    found_nonempty = True
-                    break
-            if found_nonempty:
-                break
-        if found_nonempty:
-            for R in range(mr0, mr1+1):
-                for C in range(mc0, mc1+1):
-                    if R < r0 or R > r1 or C < c0 or C > c1:
-                        continue
-                    # Convert to grid coordinates
-                    grid_r = R - r0
-                    grid_c = C - c0
-                    if 0 <= grid_r < rows and 0 <= grid_c < cols:
-                        grid[grid_r][grid_c] = 1
+        lo, hi = mc0 - c0, mc1 - c0 + 1
+        block_rows = range(mr0 - r0, mr1 - r0 + 1)
+        if any(1 in filled[rr][lo:hi] for rr in block_rows):
+            ones = [1] * (hi - lo)
+            for rr in block_rows:
+                grid[rr][lo:hi] = ones
+    return grid, content
+
+def build_nonempty_grid(ws, area, hidden_policy="ignore", opts=None) -> Tuple[List[List[int]], int, int, int, int]:
+    grid, _ = _scan_area(ws, area, hidden_policy=hidden_policy, opts=opts)
+    r0, c0, r1, c1 = area
     return grid, r0, c0, r1, c1
 
+def _advance_heights(H_prev: List[int], row: List[int]) -> List[int]:
+    """Column heights of consecutive ones ending at this grid row."""
+    return [h + 1 if v == 1 else 0 for h, v in zip(H_prev, row)]
+
+def _histogram_row_rectangles(H: List[int], r: int) -> List[Tuple[int,int,int,int]]:
+    """Maximal rectangles whose bottom edge is row r, given that row's heights H."""
+    rects = []
+    append = rects.append
+    # Monotone stack kept as two parallel lists (start index, height)
+    stack_i = []
+    stack_h = []
+    for c, h in enumerate(H + [0]):
+        last = c
+        while stack_h and stack_h[-1] > h:
+            # Popped entries always have height > 0 and start < c
+            hh = stack_h.pop()
+            last = stack_i.pop()
+            append((r - hh + 1, last, r, c - 1))
+        if not stack_h or stack_h[-1] < h:
+            stack_i.append(last)
+            stack_h.append(h)
+    return rects
+
+def _histogram_row_best(H: List[int], r: int) -> Tuple[int, Optional[Tuple[int,int,int,int]]]:
+    """Largest rectangle whose bottom edge is row r, without building the full list.
+
+    Ties keep the first rectangle in _histogram_row_rectangles' order.
+    """
+    best_area, best = 0, None
+    stack_i = []
+    stack_h = []
+    for c, h in enumerate(H + [0]):
+        last = c
+        while stack_h and stack_h[-1] > h:
+            hh = stack_h.pop()
+            last = stack_i.pop()
+            area = hh * (c - last)
+            if area > best_area:
+                best_area, best = area, (r - hh + 1, last, r, c - 1)
+        if not stack_h or stack_h[-1] < h:
+            stack_i.append(last)
+            stack_h.append(h)
+    return best_area, best
+
 def enumerate_histogram_rectangles(grid: List[List[int]]) -> List[Tuple[int,int,int,int]]:
     if not grid or not grid[0]:
         return []
-    R = len(grid)
-    C = len(grid[0])
-    H = [0]*C
+    H = [0]*len(grid[0])
     rects = []
-    for r in range(R):
-        for c in range(C):
-            H[c] = H[c] + 1 if grid[r][c] == 1 else 0
-        stack = []  # (start_index, height)
-        for c in range(C + 1):
-            h = H[c] if c < C else 0
-            last = c
-            while stack and stack[-1][1] > h:
-                i, hh = stack.pop()
-                width = c - i
-                top = r - hh + 1
-                left = i
-                bottom = r
-                right = c - 1
-                if hh > 0 and width > 0:
-                    rects.append((top, left, bottom, right))
-                last = i
-            if not stack or stack[-1][1] < h:
-                stack.append((last, h))
+    for r, row in enumerate(grid):
+        H = _advance_heights(H, row)
+        rects.extend(_histogram_row_rectangles(H, r))
     return rects
 
 def carve_rectangles(grid: List[List[int]]) -> List[Tuple[int,int,int,int]]:
-    def any_ones(g):
-        for row in g:
-            if any(v == 1 for v in row):
-                return True
-        return False
-
     out = []
     g = [row[:] for row in grid]
-    while any_ones(g):
-        candidates = enumerate_histogram_rectangles(g)
-        if not candidates:
+    R = len(g)
+    C = len(g[0]) if R else 0
+    # Per-row histogram state and the first largest rectangle ending on each row.
+    # Carving a rectangle only changes rows from its top down, so rows above
+    # keep their cached state. Below the carved rectangle the rescan stops at
+    # the first row whose heights come out unchanged: every later row then
+    # sees the same heights and the same grid, so its cached state still holds.
+    heights = [None]*R
+    row_best = [(0, None)]*R
+    rescan_from = 0
+    carved_bottom = R
+    # Carved rectangles are all ones, so a running count replaces rescanning for ones
+    remaining = sum(row.count(1) for row in g)
+    while remaining > 0:
+        H = heights[rescan_from-1] if rescan_from else [0]*C
+        for r in range(rescan_from, R):
+            H = _advance_heights(H, g[r])
+            if r > carved_bottom and H == heights[r]:
+                break
+            heights[r] = H
+            row_best[r] = _histogram_row_best(H, r)
+        # Largest area wins; ties go to the earliest in row-major enumeration order
+        best_area, chosen = 0, None
+        for area, rect in row_best:
+            if area > best_area:
+                best_area, chosen = area, rect
+        if chosen is None:
             break
-        candidates.sort(key=lambda r: ((r[2]-r[0]+1)*(r[3]-r[1]+1)), reverse=True)
-        top,left,bottom,right = candidates[0]
+        top,left,bottom,right = chosen
         out.append((top,left,bottom,right))
+        zeros = [0]*(right-left+1)
         for r in range(top, bottom+1):
-            for c in range(left, right+1):
-                g[r][c] = 0
-    out.sort(key=lambda r: (r[0], r[1], (r[2]-r[0]+1)*(r[3]-r[1]+1)))
+            g[r][left:right+1] = zeros
+        remaining -= best_area
+        rescan_from = top
+        carved_bottom = bottom
+    # Carved rectangles are disjoint, so no two share a top-left corner and
+    # plain tuple order matches ordering by (top, left, area)
+    out.sort()
     return out
 
 def bfs_components(grid: List[List[int]]) -> List[Set[Tuple[int,int]]]:
     R = len(grid); C = len(grid[0]) if R else 0
-    seen = [[False]*C for _ in range(R)]
+    # Flat byte grid with a zero border: neighbours are index offsets and need no
+    # bounds checks, and clearing a byte doubles as the "seen" mark.
+    W = C + 2
+    flat = bytearray((R + 2) * W)
+    for r, row in enumerate(grid):
+        base = (r + 1) * W + 1
+        flat[base:base + C] = bytes(1 if v == 1 else 0 for v in row)
     comps = []
-    from collections import deque
-    for r in range(R):
-        for c in range(C):
-            if grid[r][c] == 1 and not seen[r][c]:
-                q = deque()
-                q.append((r,c)); seen[r][c] = True
-                comp = set()
-                comp.add((r,c))
-                while q:
-                    rr,cc = q.popleft()
-                    for dr,dc in ((1,0),(-1,0),(0,1),(0,-1)):
-                        nr,nc = rr+dr, cc+dc
-                        if 0<=nr<R and 0<=nc<C and grid[nr][nc]==1 and not seen[nr][nc]:
-                            seen[nr][nc]=True
-                            q.append((nr,nc))
-                            comp.add((nr,nc))
-                comps.append(comp)
+    # bytearray.find jumps to the next unseen cell in C instead of testing
+    # every cell of the grid in the interpreter
+    start = flat.find(1)
+    while start != -1:
+        flat[start] = 0
+        members = [start]
+        stack = [start]
+        while stack:
+            i = stack.pop()
+            for j in (i + W, i - W, i + 1, i - 1):
+                if flat[j]:
+                    flat[j] = 0
+                    stack.append(j)
+                    members.append(j)
+        comps.append({(j // W - 1, j % W - 1) for j in members})
+        start = flat.find(1, start + 1)
     return comps
 
 def rectangles_for_component(comp: Set[Tuple[int,int]], grid_shape: Tuple[int,int]) -> List[Tuple[int,int,int,int]]:
     """Build a mask for the component and carve rectangles inside it."""
-    R,C = grid_shape
-    # Build component-only grid
-    g = [[0]*C for _ in range(R)]
+    if not comp:
+        return []
+    # Build a component-only grid cropped to the component's bounding box;
+    # cells outside it are all zero and cannot change the carving
+    rows = [r for r, _ in comp]
+    cols = [c for _, c in comp]
+    min_r, min_c, max_r, max_c = min(rows), min(cols), max(rows), max(cols)
+    # A component that fills its bounding box is carved as that single rectangle
+    if len(comp) == (max_r - min_r + 1) * (max_c - min_c + 1):
+        return [(min_r, min_c, max_r, max_c)]
+    g = [[0]*(max_c - min_c + 1) for _ in range(max_r - min_r + 1)]
     for (r,c) in comp:
-        g[r][c] = 1
-    return carve_rectangles(g)
+        g[r - min_r][c - min_c] = 1
+    return [(t + min_r, l + min_c, b + min_r, rr + min_c) for (t, l, b, rr) in carve_rectangles(g)]
 
 def union_rects(rects: List[Tuple[int,int,int,int]]) -> List[Tuple[int,int,int,int]]:
     """Line-sweep union of rectangles (row-based), returns disjoint rectangles covering union."""
     if not rects:
         return []
     events = {}
-    min_r = min(r0 for r0,_,r1,_ in rects)
-    max_r = max(r1 for r0,_,r1,_ in rects)
     for r0,c0,r1,c1 in rects:
         events.setdefault(r0, []).append(("add",(c0,c1)))
         events.setdefault(r1+1, []).append(("rem",(c0,c1)))
-    active: List[Tuple[int,int]] = []
+    # Active column intervals as a multiset (interval -> count)
+    active: Dict[Tuple[int,int], int] = {}
     def merge_intervals(iv):
         if not iv: return []
         iv.sort()
@@ -181,21 +298,21 @@ def union_rects(rects: List[Tuple[int,int,int,int]]) -> List[Tuple[int,int,int,i
     out_rects = []
     prev_row = None
     prev_spans = []
-    # sweep rows
-    for row in range(min_r, max_r+2):  # include sentinel
-        for ev in events.get(row, []):
-            kind,(s,e) = ev
+    # sweep only rows where an interval starts or ends (the spans are constant
+    # in between); the last event row empties the active set and closes the final run
+    for row in sorted(events):
+        for kind,(s,e) in events[row]:
             if kind=="add":
-                active.append((s,e))
-            else:
-                try:
-                    active.remove((s,e))
-                except ValueError:
-                    pass
-        spans = merge_intervals(active)
+                active[(s,e)] = active.get((s,e), 0) + 1
+            elif (s,e) in active:
+                if active[(s,e)] == 1:
+                    del active[(s,e)]
+                else:
+                    active[(s,e)] -= 1
+        spans = merge_intervals(list(active))
         if prev_row is None:
             prev_row = row
-            prev_spans = [(s,e) for s,e in spans]
+            prev_spans = spans
             continue
         # If spans changed, close previous run
         if spans != prev_spans:
@@ -203,160 +320,117 @@ def union_rects(rects: List[Tuple[int,int,int,int]]) -> List[Tuple[int,int,int,i
             for s,e in prev_spans:
                 out_rects.append((prev_row, s, row-1, e))
             prev_row = row
-            prev_spans = [(s,e) for s,e in spans]
+            prev_spans = spans
     return out_rects
 
-def grid_to_tables(ws, area, hidden_policy="ignore", opts=None):
-    """Return list of logical tables; each table: dict with 'rects' (list of sheet-coord rects) and 'bbox'"""
+def grid_to_tables(ws, area, hidden_policy="ignore", opts=None, merged_lookup=None, merged_ranges=None):
+    """Return list of logical tables; each table: dict with 'rects' (list of sheet-coord rects) and 'bbox'
+
+    merged_lookup / merged_ranges may be passed when the caller already built
+    build_merged_lookup(ws, area) or merged_range_bounds(ws).
+    """
     if opts is None:
         opts = {}
-    grid, r0, c0, r1, c1 = build_nonempty_grid(ws, area, hidden_policy=hidden_policy, opts=opts)
+    grid, content = _scan_area(ws, area, hidden_policy=hidden_policy, opts=opts, merged_ranges=merged_ranges)
+    r0, c0, r1, c1 = area
 
     # Detect empty rows and columns to split tables
     # Note: Check actual cells, not grid (which may be marked by merged cells)
     R = len(grid)
     C = len(grid[0]) if R else 0
 
-    # Find completely empty rows by checking actual cells
-    # For row emptiness detection, we check:
+    # Find completely empty rows and columns by checking actual cells
+    # For emptiness detection, we check:
     # 1. Cell value (text) - must be empty or whitespace only
     # 2. Cell fill - white fill is treated as no fill (same as blank)
     #    Any other color means the cell is not empty
-    merged_lookup = build_merged_lookup(ws, area)
+    # Both were read once per cell by _scan_area (content).
+    if merged_lookup is None:
+        merged_lookup = build_merged_lookup(ws, area, merged_ranges)
 
+    # Only the top-left cell of a merged range counts, so mask out the other
+    # merged cells per row; a row is empty when its masked bitmap is zero and
+    # a column is empty when its bit is clear in the OR of all row bitmaps.
+    covered = [0]*R
+    for (row_num, col_num), tl in merged_lookup.items():
+        if (row_num, col_num) != tl and r0 <= row_num <= r1 and c0 <= col_num <= c1:
+            covered[row_num - r0] |= 1 << (col_num - c0)
     empty_rows = set()
+    col_bits = 0
     for r in range(R):
-        row_num = r0 + r
-        is_empty = True
-        for c in range(C):
-            col_num = c0 + c
-            # Check if this cell is part of a merged range
-            tl = merged_lookup.get((row_num, col_num))
-            if tl:
-                # Only check the top-left cell of merged ranges
-                if (row_num, col_num) != tl:
-                    continue  # Skip non-top-left cells in merged ranges
-                cell = ws.cell(row=tl[0], column=tl[1])
-            else:
-                cell = ws.cell(row=row_num, column=col_num)
-            # Check cell value and fill
-            text = cell_display_value(cell, opts)
-            has_text = text and text.strip()
-            # If cell has fill (not white), it's not empty
-            has_fill = not no_fill(cell, opts.get("readonly_fill_policy", "assume_no_fill"))
-            if has_text or has_fill:
-                is_empty = False
-                break
-        if is_empty:
+        bits = content[r] & ~covered[r]
+        if bits:
+            col_bits |= bits
+        else:
             empty_rows.add(r)
-
-    # Find completely empty columns by checking actual cells
-    # For column emptiness detection, we check:
-    # 1. Cell value (text) - must be empty or whitespace only
-    # 2. Cell fill - white fill is treated as no fill (same as blank)
-    #    Any other color means the cell is not empty
-    # We need to consider merged cells: only check the top-left cell of merged ranges.
-    empty_cols = set()
-    for c in range(C):
-        col_num = c0 + c
-        is_empty = True
-        for r in range(R):
-            row_num = r0 + r
-            # Check if this cell is part of a merged range
-            tl = merged_lookup.get((row_num, col_num))
-            if tl:
-                # Only check the top-left cell of merged ranges
-                if (row_num, col_num) != tl:
-                    continue  # Skip non-top-left cells in merged ranges
-                cell = ws.cell(row=tl[0], column=tl[1])
-            else:
-                cell = ws.cell(row=row_num, column=col_num)
-            # Check cell value and fill
-            text = cell_display_value(cell, opts)
-            has_text = text and text.strip()
-            # If cell has fill (not white), it's not empty
-            has_fill = not no_fill(cell, opts.get("readonly_fill_policy", "assume_no_fill"))
-            if has_text or has_fill:
-                is_empty = False
-                break
-        if is_empty:
-            empty_cols.add(c)
+    empty_cols = {c for c in range(C) if not (col_bits >> c) & 1}
 
     # Split grid by empty rows/columns: only connect cells horizontally or vertically
-    # but not across empty rows/columns
-    def is_connected(r1, c1, r2, c2):
-        """Check if two adjacent cells can be in the same table (not separated by empty row/col)"""
-        # For adjacent cells (dr=±1 or dc=±1), check if there's an empty row/col between them
-        # Same row (horizontal neighbors): check if any column between is empty
-        if r1 == r2:
-            min_c, max_c = min(c1, c2), max(c1, c2)
-            # For adjacent cells, max_c - min_c should be 1, so check if min_c or max_c is in empty_cols
-            return not (min_c in empty_cols or max_c in empty_cols)
-        # Same column (vertical neighbors): check if any row between is empty
-        if c1 == c2:
-            min_r, max_r = min(r1, r2), max(r1, r2)
-            # For adjacent cells, max_r - min_r should be 1, so check if min_r or max_r is in empty_rows
-            return not (min_r in empty_rows or max_r in empty_rows)
-        # Different row and column: check if they can be connected via a path
-        # Two cells in different rows and columns can be in the same table if:
-        # 1. They are in adjacent rows (dr=±1) and their columns are not separated by empty columns
-        # 2. They are in adjacent columns (dc=±1) and their rows are not separated by empty rows
-        dr = abs(r2 - r1)
-        dc = abs(c2 - c1)
-        if dr == 1 and dc == 1:
-            # Diagonal neighbors: check if both horizontal and vertical paths are not blocked
-            # Check horizontal path: (r1, c1) -> (r1, c2) -> (r2, c2)
-            h_path_ok = not (c1 in empty_cols or c2 in empty_cols) and r1 not in empty_rows
-            # Check vertical path: (r1, c1) -> (r2, c1) -> (r2, c2)
-            v_path_ok = not (r1 in empty_rows or r2 in empty_rows) and c1 not in empty_cols
-            # If either path is open, they can be connected
-            return h_path_ok or v_path_ok
-        # Not adjacent: not directly connected
-        return False
-
-    seen = [[False]*C for _ in range(R)]
+    # but not across empty rows/columns. For neighbours (r1,c1) -> (r2,c2):
+    # - horizontal: neither column is empty
+    # - vertical: neither row is empty
+    # - diagonal: r1 and c1 are not empty, and either r2 or c2 is not empty
+    #   (the horizontal or the vertical path around the corner is open)
+    row_ok = [False] + [r not in empty_rows for r in range(R)] + [False]
+    col_ok = [False] + [c not in empty_cols for c in range(C)] + [False]
+
+    # Connected components (8-neighbourhood) on a flat byte grid with a zero
+    # border, as in bfs_components; row_ok/col_ok are padded to match
+    W = C + 2
+    flat = bytearray((R + 2) * W)
+    for r, row in enumerate(grid):
+        base = (r + 1) * W + 1
+        flat[base:base + C] = bytes(1 if v == 1 else 0 for v in row)
     comps = []
-    from collections import deque
-    for r in range(R):
-        for c in range(C):
-            if grid[r][c] == 1 and not seen[r][c]:
-                q = deque()
-                q.append((r,c)); seen[r][c] = True
-                comp = set()
-                comp.add((r,c))
-                while q:
-                    rr,cc = q.popleft()
-                    for dr,dc in ((1,0),(-1,0),(0,1),(0,-1),(1,1),(1,-1),(-1,1),(-1,-1)):
-                        nr,nc = rr+dr, cc+dc
-                        if 0<=nr<R and 0<=nc<C and grid[nr][nc]==1 and not seen[nr][nc]:
-                            # Only connect if not separated by empty row/column
-                            if is_connected(rr, cc, nr, nc):
-                                seen[nr][nc]=True
-                                q.append((nr,nc))
-                                comp.add((nr,nc))
-                comps.append(comp)
+    start = flat.find(1)
+    while start != -1:
+        flat[start] = 0
+        members = [start]
+        stack = [start]
+        while stack:
+            i = stack.pop()
+            rr, cc = divmod(i, W)
+            ro = row_ok[rr]
+            co = col_ok[cc]
+            if co:
+                for j, ncc in ((i - 1, cc - 1), (i + 1, cc + 1)):
+                    if flat[j] and col_ok[ncc]:
+                        flat[j] = 0
+                        stack.append(j)
+                        members.append(j)
+            if ro:
+                for j, nrr in ((i - W, rr - 1), (i + W, rr + 1)):
+                    if flat[j] and row_ok[nrr]:
+                        flat[j] = 0
+                        stack.append(j)
+                        members.append(j)
+                if co:
+                    for j, nrr, ncc in ((i - W - 1, rr - 1, cc - 1), (i - W + 1, rr - 1, cc + 1),
+                                        (i + W - 1, rr + 1, cc - 1), (i + W + 1, rr + 1, cc + 1)):
+                        if flat[j] and (row_ok[nrr] or col_ok[ncc]):
+                            flat[j] = 0
+                            stack.append(j)
+                            members.append(j)
+        # Map flat indices straight to sheet coordinates (row 1 of the padded
+        # grid is sheet row r0, column 1 is sheet column c0)
+        comps.append({(r0 - 1 + j // W, c0 - 1 + j % W) for j in members})
+        start = flat.find(1, start + 1)
 
     tables = []
-    for comp in comps:
-        rects_local = rectangles_for_component(comp, (len(grid), len(grid[0])))
-        rects_sheet = [(r0+t, c0+l, r0+b, c0+r) for (t,l,b,r) in rects_local]
-        min_r = min(r for r,c in comp)
-        max_r = max(r for r,c in comp)
-        min_c = min(c for r,c in comp)
-        max_c = max(c for r,c in comp)
-        bbox = (r0+min_r, c0+min_c, r0+max_r, c0+max_c)
-        mask = {(r0+r, c0+c) for (r,c) in comp if r0 <= r0+r <= r1 and c0 <= c0+c <= c1}
-        bbox_min_row = max(bbox[0], r0)
-        bbox_min_col = max(bbox[1], c0)
-        bbox_max_row = min(bbox[2], r1)
-        bbox_max_col = min(bbox[3], c1)
-        bbox = (bbox_min_row, bbox_min_col, bbox_max_row, bbox_max_col)
+    for mask in comps:
+        # Carving only uses offsets within the component, so sheet coordinates
+        # give sheet rectangles directly
+        rects_sheet = rectangles_for_component(mask, (R, C))
+        # Component cells come from the grid, so they always lie inside the
+        # area and the bbox needs no clamping
+        rows, cols = zip(*mask)
+        bbox = (min(rows), min(cols), max(rows), max(cols))
         tables.append({"rects": rects_sheet, "bbox": bbox, "mask": mask})
     # sort by (top,left)
     tables.sort(key=lambda t: (t["bbox"][0], t["bbox"][1]))
     return tables
 
-def build_merged_lookup(ws, area=None):
+def build_merged_lookup(ws, area=None, merged_ranges=None):
     """Map each cell (r,c) in a merged range to its top-left (r0,c0).
 
     If area is provided, only cells within the print area are included.
@@ -366,26 +440,27 @@ def build_merged_lookup(ws, area=None):
         area: Optional print area tuple (r0, c0, r1, c1). If provided, only merged cells
               that intersect with the print area are included, and only cells within
               the print area are added to the lookup.
+        merged_ranges: Optional merged_range_bounds(ws) result, materialized once by
+              the caller and shared across areas.
     """
+    if merged_ranges is None:
+        merged_ranges = merged_range_bounds(ws)
+    if area is not None:
+        area_r0, area_c0, area_r1, area_c1 = area
     lookup = {}
-    for rng in getattr(ws, "merged_cells", []):
-        try:
-            r0,c0,r1,c1 = rng.min_row, rng.min_col, rng.max_row, rng.max_col
-        except Exception:
-            continue
-
+    for r0,c0,r1,c1 in merged_ranges:
         if area is not None:
-            area_r0, area_c0, area_r1, area_c1 = area
             if r1 < area_r0 or r0 > area_r1 or c1 < area_c0 or c0 > area_c1:
                 continue
             if r0 < area_r0 or c0 < area_c0:
                 continue
+            # The top-left is inside the area, so only the far edges need clipping
+            r1 = min(r1, area_r1)
+            c1 = min(c1, area_c1)
 
+        tl = (r0,c0)
+        cols = range(c0, c1+1)
         for R in range(r0, r1+1):
-            for C in range(c0, c1+1):
-                if area is not None:
-                    area_r0, area_c0, area_r1, area_c1 = area
-                    if R < area_r0 or R > area_r1 or C < area_c0 or C > area_c1:
-                        continue  # This cell is outside print area
-                lookup[(R,C)] = (r0,c0)
+            for C in cols:
+                lookup[(R,C)] = tl
     return lookup
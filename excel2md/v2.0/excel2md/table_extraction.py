@@ -4,15 +4,73 @@
 仕様書参照: §5 セル・テーブル処理規則
 """
 
+import re
+import sys
 from typing import Dict, List, Set, Tuple
 
-from .cell_utils import md_escape, cell_display_value, cell_is_empty, hyperlink_info, is_valid_url, normalize_numeric_text, has_border
+from .cell_utils import md_escape, cell_display_value, cell_is_empty, hyperlink_info, is_valid_url, normalize_numeric_text, numeric_normalization_enabled, has_border
 from .output import warn
+from .table_detection import merged_range_bounds
 from .workbook_loader import a1_from_rc
 from .mermaid_generator import is_flow_table, build_mermaid
 from .table_formatting import make_markdown_table, format_table_as_text_or_nested, build_code_block_from_rows
 
-def detect_table_title(ws, table, merged_lookup, opts, print_area=None):
+# Numeric-like text always contains a digit
+_HAS_DIGIT = re.compile(r"\d")
+
+# Hyperlink rendering per hyperlink_mode. Each formatter takes the cell text, the
+# display text, the link and add_note(link) -> footnote number; modes without an
+# entry (text_only) keep the cell text.
+def _link_keep_text(text, disp, link, add_note):
+    return text
+
+def _link_inline(text, disp, link, add_note):
+    return f"[{disp}]({link})"
+
+def _target_inline_plain(text, disp, link, add_note):
+    return f"{disp} ({link})"
+
+def _target_footnote(text, disp, link, add_note):
+    return f"{text}[^{add_note(link)}]"
+
+def _target_both(text, disp, link, add_note):
+    return f"[{disp}]({link})[^{add_note(link)}]"
+
+def _location_inline_plain(text, disp, link, add_note):
+    return f"{disp} (→{link})"
+
+def _location_footnote(text, disp, link, add_note):
+    return f"{disp}[^{add_note(link)}]"
+
+# External targets
+_TARGET_FORMATTERS = {
+    "inline": _link_inline,
+    "inline_plain": _target_inline_plain,
+    "footnote": _target_footnote,
+    "both": _target_both,
+}
+# In-workbook locations; "both" renders inline without a footnote
+_LOCATION_FORMATTERS = {
+    "inline": _link_inline,
+    "inline_plain": _location_inline_plain,
+    "footnote": _location_footnote,
+    "both": _link_inline,
+}
+
+def build_merged_by_top_left(ws, merged_ranges=None):
+    """Map each merged range's top-left (row, col) to the ranges starting there.
+
+    Ranges are (min_row, min_col, max_row, max_col) tuples; merged_ranges may be
+    passed when the caller already built merged_range_bounds(ws).
+    """
+    if merged_ranges is None:
+        merged_ranges = merged_range_bounds(ws)
+    by_tl: Dict[Tuple[int,int], List[Tuple[int,int,int,int]]] = {}
+    for bounds in merged_ranges:
+        by_tl.setdefault(bounds[:2], []).append(bounds)
+    return by_tl
+
+def detect_table_title(ws, table, merged_lookup, opts, print_area=None, merged_by_tl=None):
     """Detect if table has a title from a large merged cell at the top-left.
 
     Args:
@@ -21,7 +79,16 @@ def detect_table_title(ws, table, merged_lookup, opts, print_area=None):
         merged_lookup: Merged cell lookup (only includes cells within print area)
         opts: Options dictionary
         print_area: Optional print area tuple (r0, c0, r1, c1) to ensure cells outside are excluded
+        merged_by_tl: Optional build_merged_by_top_left(ws) result shared across tables
+
+    Returns:
+        (title, title_cols): title_cols is the range of columns covered by the title
+        (empty when no title is found); a range tests membership without building a set
     """
+    # A title is always the top-left of a merged cell
+    if not merged_lookup:
+        return None, range(0)
+
     min_row, min_col, max_row, max_col = table["bbox"]
     mask: Set[Tuple[int,int]] = table["mask"]
 
@@ -32,41 +99,33 @@ def detect_table_title(ws, table, merged_lookup, opts, print_area=None):
         max_row = min(max_row, area_r1)
         max_col = min(max_col, area_c1)
 
+    # The loop bounds are clipped to print_area, so every (r, c) below lies inside it
     for r in range(min_row, min(min_row + 3, max_row + 1)):
         for c in range(min_col, min(min_col + 10, max_col + 1)):
             if (r, c) not in mask:
                 continue
-            if print_area is not None:
-                area_r0, area_c0, area_r1, area_c1 = print_area
-                if r < area_r0 or r > area_r1 or c < area_c0 or c > area_c1:
-                    continue
             tl = merged_lookup.get((r, c))
             if tl and tl == (r, c):  # This is a top-left of a merged cell
                 # Get the merged range
-                merged_cells = getattr(ws, "merged_cells", None)
-                if merged_cells:
-                    for rng in merged_cells.ranges:
-                        if rng.min_row == r and rng.min_col == c:
+                if merged_by_tl is None:
+                    merged_by_tl = build_merged_by_top_left(ws)
+                for _, _, _, rng_max_col in merged_by_tl.get((r, c), ()):
+                    if print_area is not None:
+                        span_cols = min(rng_max_col, area_c1) - c + 1
+                    else:
+                        span_cols = rng_max_col - c + 1
+                    if span_cols >= 3 and r <= min_row + 2:
+                        cell = ws.cell(row=r, column=c)
+                        text = cell_display_value(cell, opts)
+                        if text and text.strip():
                             if print_area is not None:
-                                area_r0, area_c0, area_r1, area_c1 = print_area
-                                if r < area_r0 or c < area_c0:
-                                    continue
-                                span_cols = min(rng.max_col, area_c1) - c + 1
+                                exclude_cols = range(c, min(rng_max_col, area_c1) + 1)
                             else:
-                                span_cols = rng.max_col - rng.min_col + 1
-                            if span_cols >= 3 and r <= min_row + 2:
-                                cell = ws.cell(row=r, column=c)
-                                text = cell_display_value(cell, opts)
-                                if text and text.strip():
-                                    if print_area is not None:
-                                        area_r0, area_c0, area_r1, area_c1 = print_area
-                                        exclude_cols = set(range(c, min(rng.max_col, area_c1) + 1))
-                                    else:
-                                        exclude_cols = set(range(c, rng.max_col + 1))
-                                    return text.strip(), exclude_cols
-    return None, set()
-
-def extract_table(ws, table, opts, footnotes, footnote_index_start, merged_lookup, print_area=None):
+                                exclude_cols = range(c, rng_max_col + 1)
+                            return text.strip(), exclude_cols
+    return None, range(0)
+
+def extract_table(ws, table, opts, footnotes, footnote_index_start, merged_lookup, print_area=None, merged_by_tl=None):
     """Extract Markdown rows for a logical table (possibly multiple rects).
 
     Args:
@@ -77,6 +136,7 @@ def extract_table(ws, table, opts, footnotes, footnote_index_start, merged_looku
         footnote_index_start: Starting footnote index
         merged_lookup: Merged cell lookup (only includes cells within print area)
         print_area: Optional print area tuple (r0, c0, r1, c1) to ensure cells outside are excluded
+        merged_by_tl: Optional build_merged_by_top_left(ws) result shared across tables
     """
     min_row, min_col, max_row, max_col = table["bbox"]
     mask: Set[Tuple[int,int]] = table["mask"]
@@ -94,49 +154,87 @@ def extract_table(ws, table, opts, footnotes, footnote_index_start, merged_looku
     # Detect table title from large merged cell
     # Create updated table dict with filtered mask and adjusted bbox
     updated_table = {"bbox": (min_row, min_col, max_row, max_col), "mask": mask}
-    table_title, title_cols = detect_table_title(ws, updated_table, merged_lookup, opts, print_area)
-
-    # Find columns that actually have data (non-empty cells in mask), excluding title columns
-    # First, collect all columns that are in mask and not in title_cols
-    candidate_cols = set()
-    for R in range(min_row, max_row+1):
-        for C in range(min_col, max_col+1):
-            if (R, C) in mask and C not in title_cols:
-                candidate_cols.add(C)
-
-    # Then, check which columns actually have non-empty cell values
-    # Note: We need to apply the same processing as in extract_table to get the final cell values
-    # This includes: merged cell handling, numeric formatting, hyperlink processing, and markdown escaping
-    used_cols = set()
-    for C in candidate_cols:
-        has_data = False
-        for R in range(min_row, max_row+1):
-            if (R, C) not in mask:
-                continue
-            cell = ws.cell(row=R, column=C)
-            # Check merged cell handling (same as in extract_table)
-            tl = merged_lookup.get((R, C))
-            if tl:
-                if (R, C) == tl:
-                    # Top-left cell: check its value
-                    cell = ws.cell(row=tl[0], column=tl[1])
-                    text = cell_display_value(cell, opts)
-                else:
-                    # Other cells in merged range: empty if top_left_only
-                    if opts.get("merge_policy") == "top_left_only":
-                        text = ""
-                    else:
-                        cell = ws.cell(row=tl[0], column=tl[1])
-                        text = cell_display_value(cell, opts)
+    table_title, title_cols = detect_table_title(ws, updated_table, merged_lookup, opts, print_area, merged_by_tl)
+
+    # Read the clipped bbox in one pass; cells[R - min_row][C - min_col] is cell (R, C)
+    cells = [list(row) for row in ws.iter_rows(min_row=min_row, max_row=max_row, min_col=min_col, max_col=max_col)]
+    top_left_only = opts.get("merge_policy") == "top_left_only"
+
+    # Numeric normalization leaves text unchanged under the default "keep" options
+    normalize_numbers = numeric_normalization_enabled(opts)
+
+    def process(cell, raw):
+        """Return (display text is non-blank, numeric-normalized text, hyperlink info)."""
+        # Most cells carry no hyperlink; test the attribute before building the info dict
+        hl = hyperlink_info(cell) if getattr(cell, "hyperlink", None) is not None else None
+        if not raw:
+            return False, raw, hl
+        # numeric formatting overrides
+        text = normalize_numeric_text(raw, opts) if normalize_numbers and _HAS_DIGIT.search(raw) else raw
+        return bool(raw.strip()), text, hl
+
+    def display(cell):
+        # Cells without a value display as "" (the common case in sparse tables)
+        return "" if cell.value is None else cell_display_value(cell, opts)
+
+    # Merged cells that show the top-left value share one processed entry
+    text_cache: Dict[Tuple[int,int], Tuple[bool, str, object]] = {}
+
+    def get_text(R, C):
+        """Return the processed entry for cell (R, C) of the bbox; see process()."""
+        tl = merged_lookup.get((R, C)) if merged_lookup else None
+        if tl is None:
+            # Not merged (the common case): each cell is looked up once, no caching
+            cell = cells[R - min_row][C - min_col]
+            return process(cell, display(cell))
+        if top_left_only and (R, C) != tl:
+            # Other cells in merged range: empty if top_left_only
+            return process(cells[R - min_row][C - min_col], "")
+        # Top-left, or expand/repeat: use top-left value
+        cached = text_cache.get(tl)
+        if cached is None:
+            r, c = tl
+            if min_row <= r <= max_row and min_col <= c <= max_col:
+                cell = cells[r - min_row][c - min_col]
             else:
-                text = cell_display_value(cell, opts)
+                # Merged top-left outside this table's bbox
+                cell = ws.cell(row=r, column=c)
+            cached = text_cache[tl] = process(cell, display(cell))
+        return cached
+
+    # Group the masked cells by bbox row, excluding title columns
+    mask_cols_by_row = [[] for _ in range(min_row, max_row+1)]
+    for r, c in mask:
+        if min_row <= r <= max_row and min_col <= c <= max_col and c not in title_cols:
+            mask_cols_by_row[r - min_row].append(c)
 
-            # Apply the same processing as in extract_table
-            # numeric formatting overrides
-            text = normalize_numeric_text(text, opts)
+    # One row-major pass over the masked cells: look up each cell's processed value
+    # once, mark the columns that actually have non-empty values, and keep the row's
+    # entries for the empty-row check and rendering below.
+    # Note: The data check applies the same processing as the rendering
+    # (merged cell handling, numeric formatting, hyperlink display text)
+    used_cols = set()
+    row_entries = []
+    for ri, cols in enumerate(mask_cols_by_row):
+        R = min_row + ri
+        row_cells = cells[ri]
+        entries = {}
+        # Columns whose display text is non-blank, for the empty-row check
+        text_cols = []
+        for C in cols:
+            if merged_lookup:
+                entry = entries[C] = get_text(R, C)
+            else:
+                # No merged cells: each cell is processed from its own value
+                cell = row_cells[C - min_col]
+                entry = entries[C] = process(cell, "" if cell.value is None else cell_display_value(cell, opts))
+            if entry[0]:
+                text_cols.append(C)
+            if C in used_cols:
+                continue
+            _, text, hl = entry
 
             # hyperlink processing (but we only need to check if there's data, not format it)
-            hl = hyperlink_info(cell)
             if hl:
                 disp = text if text else (hl.get("display") or "")
                 if disp and disp.strip():
@@ -144,122 +242,74 @@ def extract_table(ws, table, opts, footnotes, footnote_index_start, merged_looku
 
             # Check if text is non-empty after processing
             if text and text.strip():
-                has_data = True
-                break
-        if has_data:
-            used_cols.add(C)
+                used_cols.add(C)
+        row_entries.append((entries, text_cols))
 
     # Sort columns
+    used_col_set = used_cols
     used_cols = sorted(used_cols)
     if not used_cols:
         return [], [], False, table_title
 
     md_rows = []
     note_refs = []
-    max_cells = opts["max_cells_per_table"]
-    count_cells = 0
 
-    for R in range(min_row, max_row+1):
-        if print_area is not None:
-            area_r0, area_c0, area_r1, area_c1 = print_area
-            if R < area_r0 or R > area_r1:
-                continue
-        row_is_empty = True
-        for C in used_cols:
-            if (R, C) not in mask:
-                continue
-            if print_area is not None:
-                area_r0, area_c0, area_r1, area_c1 = print_area
-                if R < area_r0 or R > area_r1 or C < area_c0 or C > area_c1:
-                    continue  # Cell is outside print area
-            cell = ws.cell(row=R, column=C)
-            tl = merged_lookup.get((R, C))
-            if tl:
-                if (R, C) == tl:
-                    cell = ws.cell(row=tl[0], column=tl[1])
-                    text = cell_display_value(cell, opts)
-                    if text and text.strip():
-                        row_is_empty = False
-                        break
-                else:
-                    if opts.get("merge_policy") != "top_left_only":
-                        cell = ws.cell(row=tl[0], column=tl[1])
-                        text = cell_display_value(cell, opts)
-                        if text and text.strip():
-                            row_is_empty = False
-                            break
-            else:
-                text = cell_display_value(cell, opts)
-                if text and text.strip():
-                    row_is_empty = False
-                    break
+    def add_note(link):
+        n = footnote_index_start + len(note_refs)
+        note_refs.append((n, link))
+        return n
 
+    # Loop invariants
+    # Cell budget left under max_cells_per_table
+    remaining_cells = opts["max_cells_per_table"]
+    escaped_cache: Dict[str, str] = {}
+    hyperlink_mode = opts.get("hyperlink_mode")
+    format_target = _TARGET_FORMATTERS.get(hyperlink_mode, _link_keep_text)
+    format_location = _LOCATION_FORMATTERS.get(hyperlink_mode, _link_keep_text)
+    escape_level = opts["markdown_escape_level"]
+    row_width = len(used_cols)
+
+    # Rows/columns were clipped to print_area and mask was filtered to it above,
+    # so no per-cell bounds checks are needed below
+    for ri, (entries, text_cols) in enumerate(row_entries):
         # Skip completely empty rows
-        if row_is_empty:
+        if not any(C in used_col_set for C in text_cols):
             continue
 
+        # A row that does not fit in the remaining budget is cut whole, before any
+        # of its cells are rendered
+        if remaining_cells < row_width:
+            return md_rows, note_refs, True, table_title
+        remaining_cells -= row_width
+
+        R = min_row + ri
         row_vals = []
         for C in used_cols:
-            count_cells += 1
-            if count_cells > max_cells:
-                return md_rows, note_refs, True
-            if (R,C) not in mask:
+            entry = entries.get(C)
+            if entry is None:
                 row_vals.append("")
                 continue
-            if print_area is not None:
-                area_r0, area_c0, area_r1, area_c1 = print_area
-                if R < area_r0 or R > area_r1 or C < area_c0 or C > area_c1:
-                    row_vals.append("")
-                    continue
-            cell = ws.cell(row=R, column=C)
-            # merged handling
-            tl = merged_lookup.get((R,C))
-            if tl:
-                # Check if this is the top-left cell of the merged range
-                if (R, C) == tl:
-                    # Top-left cell: use its value
-                    cell = ws.cell(row=tl[0], column=tl[1])
-                    text = cell_display_value(cell, opts)
-                else:
-                    # Other cells in merged range: empty if top_left_only, otherwise use top-left value
-                    if opts.get("merge_policy") == "top_left_only":
-                        text = ""
-                    else:
-                        # expand/repeat: use top-left value
-                        cell = ws.cell(row=tl[0], column=tl[1])
-                        text = cell_display_value(cell, opts)
-            else:
-                text = cell_display_value(cell, opts)
-            # numeric formatting overrides
-            text = normalize_numeric_text(text, opts)
+            _, text, hl = entry
+            if not hl:
+                # Merged members and repeated values share one escaped string
+                escaped = escaped_cache.get(text)
+                if escaped is None:
+                    escaped = md_escape(text, escape_level)
+                    if len(escaped) < 64:
+                        escaped = sys.intern(escaped)
+                    escaped_cache[text] = escaped
+                row_vals.append(escaped)
+                continue
+            disp = text if text else (hl.get("display") or "")
+            if hl.get("target"):
+                link = hl["target"]
+                if not is_valid_url(link):
+                    warn(f"Invalid URL detected at {a1_from_rc(R,C)}: {link}")
+                text = format_target(text, disp, link, add_note)
+            elif hl.get("location"):
+                text = format_location(text, disp, hl["location"], add_note)
 
-            hl = hyperlink_info(cell)
-            if hl:
-                disp = text if text else (hl.get("display") or "")
-                if hl.get("target"):
-                    link = hl["target"]
-                    if not is_valid_url(link):
-                        warn(f"Invalid URL detected at {a1_from_rc(R,C)}: {link}")
-                    if opts["hyperlink_mode"] in ("inline", "both"):
-                        text = f"[{disp}]({link})"
-                    elif opts["hyperlink_mode"] == "inline_plain":
-                        text = f"{disp} ({link})"
-                    if opts["hyperlink_mode"] in ("footnote", "both"):
-                        n = footnote_index_start + len(note_refs)
-                        note_refs.append((n, link))
-                        text = f"{text}[^{n}]"
-                elif hl.get("location"):
-                    loc = hl["location"]
-                    if opts["hyperlink_mode"] in ("inline", "both"):
-                        text = f"[{disp}]({loc})"
-                    elif opts["hyperlink_mode"] == "inline_plain":
-                        text = f"{disp} (→{loc})"
-                    elif opts["hyperlink_mode"] in ("footnote", "both"):
-                        n = footnote_index_start + len(note_refs)
-                        note_refs.append((n, loc))
-                        text = f"{disp}[^{n}]"
-
-            text = md_escape(text, opts["markdown_escape_level"])
+            text = md_escape(text, escape_level)
             row_vals.append(text)
         md_rows.append(row_vals)
     return md_rows, note_refs, False, table_title
@@ -278,6 +328,10 @@ def dispatch_table_output(ws, tbl, md_rows, opts, merged_lookup, xlsx_path=None)
     skip_on_fallback = opts.get("dispatch_skip_code_and_mermaid_on_fallback", True)
     code_failed = False
 
+    def table_markdown():
+        hdr = opts.get("header_detection", True)
+        return make_markdown_table(md_rows, header_detection=hdr, align_detect=opts.get("align_detection", True), align_threshold=opts.get("numbers_right_threshold", 0.8))
+
     # 1) Code (最優先)
     try:
         code_block = build_code_block_from_rows(md_rows)
@@ -306,9 +360,7 @@ def dispatch_table_output(ws, tbl, md_rows, opts, merged_lookup, xlsx_path=None)
                     if ok:
                         mer = build_mermaid(md_rows, opts, colmap)
                         if opts.get("mermaid_keep_source_table", True):
-                            hdr = opts.get("header_detection", True)
-                            table_md = make_markdown_table(md_rows, header_detection=hdr, align_detect=opts.get("align_detection", True), align_threshold=opts.get("numbers_right_threshold", 0.8))
-                            return "mermaid", mer + "\n" + table_md
+                            return "mermaid", f"{mer}\n{table_markdown()}"
                         else:
                             return "mermaid", mer
         except Exception as e:
@@ -318,13 +370,11 @@ def dispatch_table_output(ws, tbl, md_rows, opts, merged_lookup, xlsx_path=None)
     # 3-5) delegate to existing logic (フォールバック時は優先度3から)
     ftype, out = format_table_as_text_or_nested(ws, tbl, md_rows, opts, merged_lookup)
     if ftype == "table":
-        hdr = opts.get("header_detection", True)
-        out = make_markdown_table(md_rows, header_detection=hdr, align_detect=opts.get("align_detection", True), align_threshold=opts.get("numbers_right_threshold", 0.8))
+        out = table_markdown()
     elif ftype in ("text","nested","code","empty"):
         pass
     else:
         # fallback to normal table
-        hdr = opts.get("header_detection", True)
-        out = make_markdown_table(md_rows, header_detection=hdr, align_detect=opts.get("align_detection", True), align_threshold=opts.get("numbers_right_threshold", 0.8))
+        out = table_markdown()
         ftype = "table"
     return ftype, out
@@ -317,19 +317,28 @@ def choose_header_row_heuristic(md_rows):
     """
     if not md_rows:
         return None
-    def numeric_ratio(row):
-        vals = [x for x in row if (x or "").strip()]
-        if not vals: return 0.0
-        nums = sum(1 for v in vals if numeric_like(v))
-        return nums/len(vals)
+    # Non-blank cells of each row the heuristic can read (up to 3 candidates and
+    # the row after the last one), computed once
+    nonblank = [[v for v in row if (v or "").strip()] for row in md_rows[:4]]
+    if not any(nonblank[:3]):
+        return None
+    ratios = {}
+    def numeric_ratio(i):
+        # Row i is the "next" row of candidate i-1 and the candidate itself after
+        # that, so each ratio is computed once
+        r = ratios.get(i)
+        if r is None:
+            vals = nonblank[i]
+            r = ratios[i] = sum(1 for v in vals if numeric_like(v)) / len(vals) if vals else 0.0
+        return r
     first_nonempty = None
     for i, row in enumerate(md_rows[:3]):  # peek first up to 3 rows
-        nonempty = sum(1 for v in row if (v or "").strip())
+        nonempty = len(nonblank[i])
         if first_nonempty is None and nonempty>0:
             first_nonempty = i
         if nonempty >= max(1, len(row)//2):
-            r_this = numeric_ratio(row)
-            r_next = numeric_ratio(md_rows[i+1]) if i+1 < len(md_rows) else 1.0
+            r_this = numeric_ratio(i)
+            r_next = numeric_ratio(i+1) if i+1 < len(md_rows) else 1.0
             if r_this < r_next:  # header tends to be less numeric than data
                 return i
     return first_nonempty if first_nonempty is not None else None
@@ -341,51 +350,56 @@ def detect_right_align(col_vals, threshold=0.8):
     non_empty = [v for v in col_vals if (v or "").strip()]
     if not non_empty:
         return False
-    numeric_count = sum(1 for v in non_empty if numeric_like(str(v)))
-    return (numeric_count / len(non_empty)) >= threshold
+    # Stop as soon as the ratio is decided either way; the comparisons use the
+    # same count / n expression as the full scan so the result is identical
+    n = len(non_empty)
+    numeric_count = 0
+    remaining = n
+    for v in non_empty:
+        remaining -= 1
+        if numeric_like(str(v)):
+            numeric_count += 1
+            if numeric_count / n >= threshold:
+                return True
+        elif (numeric_count + remaining) / n < threshold:
+            return False
+    return (numeric_count / n) >= threshold
 
 def make_markdown_table(md_rows, header_detection=True, align_detect=True, align_threshold=0.8):
     if not md_rows:
         return ""
 
-    # Remove completely empty columns
-    if md_rows:
-        cols = len(md_rows[0])
-        non_empty_cols = []
-        for c in range(cols):
-            # Check if column has any non-empty cell
-            has_data = any((row[c] if c < len(row) else "").strip() for row in md_rows)
-            if has_data:
-                non_empty_cols.append(c)
-
-        # Filter rows to only include non-empty columns
-        if non_empty_cols:
-            md_rows = [[row[c] if c < len(row) else "" for c in non_empty_cols] for row in md_rows]
-        else:
-            return ""  # All columns are empty
+    # Rows are normally all as wide as the first one; pad or cut any that are not
+    cols = len(md_rows[0])
+    if any(len(row) != cols for row in md_rows):
+        md_rows = [row[:cols] + [""] * (cols - len(row)) for row in md_rows]
+
+    # Remove completely empty columns, working on the transposed columns so the
+    # alignment pass below can reuse them
+    columns = [col for col in zip(*md_rows) if any(v.strip() for v in col)]
+    if not columns:
+        return ""  # All columns are empty
+    if len(columns) < cols:
+        md_rows = [list(row) for row in zip(*columns)]
+    cols = len(columns)
 
     header = None
     data = md_rows
     if header_detection and any((cell or "").strip() for cell in md_rows[0]):
         header = md_rows[0]
         data = md_rows[1:]
-    cols = len(header) if header else len(md_rows[0])
-    aligns = []
     if align_detect:
-        for c in range(cols):
-            col_vals = [row[c] for row in data if c < len(row)]
-            right = detect_right_align(col_vals, threshold=align_threshold)
-            aligns.append("---:" if right else "---")
+        skip = 1 if header else 0
+        aligns = ["---:" if detect_right_align(col[skip:], threshold=align_threshold) else "---"
+                  for col in columns]
     else:
         aligns = ["---"] * cols
     lines = []
     if header:
         lines.append("| " + " | ".join(header) + " |")
         lines.append("| " + " | ".join(aligns) + " |")
-    for row in data if header else md_rows:
-        if len(row) < cols:
-            row = row + [""] * (cols - len(row))
-        lines.append("| " + " | ".join(row) + " |")
+    # Every row has exactly `cols` cells here, so rows are joined as-is
+    lines.extend(["| " + " | ".join(row) + " |" for row in (data if header else md_rows)])
     return "\n".join(lines)
 
 # ===== CSV Markdown Output Functions =====
@@ -19,7 +19,18 @@ def load_workbook_safe(path, read_only=False):
         sys.exit(2)
 
 
+# 列番号→列文字の対応表（Excelの最大列XFD=16384まで、初回呼び出し時に作成）
+_COL_LETTERS = None
+
+
 def a1_from_rc(r: int, c: int) -> str:
+    global _COL_LETTERS
+    if _COL_LETTERS is None:
+        from openpyxl.utils import get_column_letter
+        _COL_LETTERS = ("",) + tuple(get_column_letter(i) for i in range(1, 16385))
+    if 0 < c < len(_COL_LETTERS):
+        return f"{_COL_LETTERS[c]}{r}"
+    # 範囲外はopenpyxlに任せる（不正な列番号のエラーもそのまま）
     from openpyxl.utils import get_column_letter
     return f"{get_column_letter(c)}{r}"
 
@@ -7,7 +7,7 @@
 from excel2md.cli import build_argparser, main
 from excel2md.runner import run
 from excel2md import __version__ as VERSION
-from excel2md.output import warn, info
+from excel2md.output import warn, warn_once, info
 from excel2md.cell_utils import (
     remove_control_chars,
     is_whitespace_only,
@@ -19,6 +19,7 @@ from excel2md.cell_utils import (
     cell_is_empty,
     numeric_like,
     normalize_numeric_text,
+    numeric_normalization_enabled,
     hyperlink_info,
     is_valid_url,
     has_border,
@@ -27,6 +28,7 @@ from excel2md.workbook_loader import load_workbook_safe, a1_from_rc, parse_dimen
 from excel2md.mermaid_generator import (
     _v14_normalize_header_name,
     _v14_sanitize_node_id,
+    _v14_escape_mermaid_text,
     _v14_resolve_columns_by_name,
     _v14_extract_shapes_to_mermaid,
     _v14_infer_edges,
@@ -44,8 +46,9 @@ from excel2md.table_detection import (
     union_rects,
     grid_to_tables,
     build_merged_lookup,
+    merged_range_bounds,
 )
-from excel2md.table_extraction import detect_table_title, extract_table, dispatch_table_output
+from excel2md.table_extraction import build_merged_by_top_left, detect_table_title, extract_table, dispatch_table_output
 from excel2md.table_formatting import (
     is_source_code,
     detect_code_language,
@@ -62,6 +65,7 @@ __all__ = [
     "build_argparser",
     "main",
     "warn",
+    "warn_once",
     "info",
     "remove_control_chars",
     "is_whitespace_only",
@@ -73,6 +77,7 @@ __all__ = [
     "cell_is_empty",
     "numeric_like",
     "normalize_numeric_text",
+    "numeric_normalization_enabled",
     "hyperlink_info",
     "is_valid_url",
     "load_workbook_safe",
@@ -81,6 +86,7 @@ __all__ = [
     "get_print_areas",
     "_v14_normalize_header_name",
     "_v14_sanitize_node_id",
+    "_v14_escape_mermaid_text",
     "_v14_resolve_columns_by_name",
     "_v14_extract_shapes_to_mermaid",
     "_v14_infer_edges",
@@ -98,6 +104,8 @@ __all__ = [
     "union_rects",
     "grid_to_tables",
     "build_merged_lookup",
+    "merged_range_bounds",
+    "build_merged_by_top_left",
     "detect_table_title",
     "extract_table",
     "has_border",
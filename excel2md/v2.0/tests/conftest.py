@@ -3,12 +3,11 @@ pytest fixtures for excel2md unit tests.
 """
 import sys
 from pathlib import Path
-from unittest.mock import MagicMock
+from types import SimpleNamespace as NS
 
 import pytest
 import openpyxl
 from openpyxl.styles import PatternFill, Font
-from openpyxl.cell.cell import Cell
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
@@ -17,6 +16,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 # Workbook/Worksheet Fixtures
 # ============================================================
 
+# Function-scoped: tests write cells into the active sheet of these workbooks
 @pytest.fixture
 def empty_workbook():
     """Create an empty Workbook."""
@@ -161,25 +161,19 @@ def default_opts():
 @pytest.fixture
 def opts_no_strip(default_opts):
     """Options with strip_whitespace=False."""
-    opts = default_opts.copy()
-    opts["strip_whitespace"] = False
-    return opts
+    return {**default_opts, "strip_whitespace": False}
 
 
 @pytest.fixture
 def opts_csv_no_description(default_opts):
     """Options for CSV markdown without description."""
-    opts = default_opts.copy()
-    opts["csv_include_description"] = False
-    return opts
+    return {**default_opts, "csv_include_description": False}
 
 
 @pytest.fixture
 def opts_csv_no_metadata(default_opts):
     """Options for CSV markdown without metadata."""
-    opts = default_opts.copy()
-    opts["csv_include_metadata"] = False
-    return opts
+    return {**default_opts, "csv_include_metadata": False}
 
 
 # ============================================================
@@ -199,40 +193,19 @@ def create_mock_cell(value=None, fill_color=None, hyperlink_target=None,
         is_date: Whether cell should be treated as date
 
     Returns:
-        MagicMock object simulating an openpyxl Cell
+        SimpleNamespace with the Cell attributes the helpers read
     """
-    cell = MagicMock(spec=Cell)
-    cell.value = value
-    cell.is_date = is_date
-
-    # Fill setup
-    if fill_color:
-        cell.fill = MagicMock()
-        cell.fill.patternType = 'solid'
-        cell.fill.fgColor = MagicMock()
-        cell.fill.fgColor.rgb = fill_color
-        cell.fill.fgColor.type = 'rgb'
-    else:
-        cell.fill = MagicMock()
-        cell.fill.patternType = None
-
-    # Hyperlink setup
+    hyperlink = None
     if hyperlink_target or hyperlink_location:
-        cell.hyperlink = MagicMock()
-        cell.hyperlink.target = hyperlink_target
-        cell.hyperlink.location = hyperlink_location
-        cell.hyperlink.display = str(value) if value else None
+        hyperlink = NS(target=hyperlink_target, location=hyperlink_location,
+                       display=str(value) if value else None)
+    if fill_color:
+        fill = NS(patternType='solid', fgColor=NS(rgb=fill_color, type='rgb'), bgColor=NS(rgb=None, type=None))
     else:
-        cell.hyperlink = None
-
-    # Border setup (no borders by default)
-    cell.border = MagicMock()
-    cell.border.left = MagicMock(style=None)
-    cell.border.right = MagicMock(style=None)
-    cell.border.top = MagicMock(style=None)
-    cell.border.bottom = MagicMock(style=None)
-
-    return cell
+        fill = NS(patternType=None)
+    # No borders by default
+    border = NS(left=NS(style=None), right=NS(style=None), top=NS(style=None), bottom=NS(style=None))
+    return NS(value=value, is_date=is_date, fill=fill, hyperlink=hyperlink, border=border)
 
 
 # ============================================================
@@ -281,7 +254,8 @@ def sample_code_rows():
     ]
 
 
-@pytest.fixture
+# The CSV data dicts are only read by write_csv_markdown, so one copy per module is shared
+@pytest.fixture(scope="module")
 def sample_csv_data_dict():
     """Sample CSV data dictionary for write_csv_markdown tests."""
     return {
@@ -298,7 +272,7 @@ def sample_csv_data_dict():
     }
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def sample_csv_data_dict_multi_sheet():
     """Multi-sheet CSV data dictionary."""
     return {
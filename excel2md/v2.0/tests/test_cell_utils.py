@@ -4,7 +4,7 @@ Unit tests for cell utility functions.
 import pytest
 import sys
 from pathlib import Path
-from unittest.mock import MagicMock
+from types import SimpleNamespace as NS
 
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
@@ -15,6 +15,7 @@ from excel_to_md import (
     no_fill,
     numeric_like,
     normalize_numeric_text,
+    numeric_normalization_enabled,
     md_escape,
     a1_from_rc,
     remove_control_chars,
@@ -23,7 +24,6 @@ from excel_to_md import (
 
 # Import create_mock_cell from conftest (pytest auto-loads conftest.py)
 # But we need to define it here for direct use in test methods
-from openpyxl.cell.cell import Cell
 
 
 def create_mock_cell(value=None, fill_color=None, hyperlink_target=None,
@@ -31,38 +31,17 @@ def create_mock_cell(value=None, fill_color=None, hyperlink_target=None,
     """
     Create a mock cell for testing.
     """
-    cell = MagicMock(spec=Cell)
-    cell.value = value
-    cell.is_date = is_date
-
-    # Fill setup
-    if fill_color:
-        cell.fill = MagicMock()
-        cell.fill.patternType = 'solid'
-        cell.fill.fgColor = MagicMock()
-        cell.fill.fgColor.rgb = fill_color
-        cell.fill.fgColor.type = 'rgb'
-    else:
-        cell.fill = MagicMock()
-        cell.fill.patternType = None
-
-    # Hyperlink setup
+    hyperlink = None
     if hyperlink_target or hyperlink_location:
-        cell.hyperlink = MagicMock()
-        cell.hyperlink.target = hyperlink_target
-        cell.hyperlink.location = hyperlink_location
-        cell.hyperlink.display = str(value) if value else None
+        hyperlink = NS(target=hyperlink_target, location=hyperlink_location,
+                       display=str(value) if value else None)
+    if fill_color:
+        fill = NS(patternType='solid', fgColor=NS(rgb=fill_color, type='rgb'), bgColor=NS(rgb=None, type=None))
     else:
-        cell.hyperlink = None
-
-    # Border setup (no borders by default)
-    cell.border = MagicMock()
-    cell.border.left = MagicMock(style=None)
-    cell.border.right = MagicMock(style=None)
-    cell.border.top = MagicMock(style=None)
-    cell.border.bottom = MagicMock(style=None)
-
-    return cell
+        fill = NS(patternType=None)
+    # No borders by default
+    border = NS(left=NS(style=None), right=NS(style=None), top=NS(style=None), bottom=NS(style=None))
+    return NS(value=value, is_date=is_date, fill=fill, hyperlink=hyperlink, border=border)
 
 
 # ============================================================
@@ -93,6 +72,16 @@ class TestA1FromRC:
         assert a1_from_rc(1000, 1) == "A1000"
         assert a1_from_rc(1048576, 1) == "A1048576"
 
+    def test_last_excel_column_and_beyond(self):
+        """Test the last Excel column (XFD) and columns past it."""
+        assert a1_from_rc(1, 16384) == "XFD1"
+        assert a1_from_rc(1, 16385) == "XFE1"
+
+    def test_invalid_column(self):
+        """Column 0 is rejected."""
+        with pytest.raises(ValueError):
+            a1_from_rc(1, 0)
+
 
 # ============================================================
 # Tests for is_whitespace_only
@@ -254,30 +243,25 @@ class TestNormalizeNumericText:
 
     def test_strip_currency_symbol(self, default_opts):
         """Strip currency symbol when configured."""
-        opts = default_opts.copy()
-        opts["currency_symbol"] = "strip"
+        opts = {**default_opts, "currency_symbol": "strip"}
         result = normalize_numeric_text("¥1,234", opts)
         assert "¥" not in result
 
     def test_remove_thousand_separator(self, default_opts):
         """Remove thousand separator when configured."""
-        opts = default_opts.copy()
-        opts["numeric_thousand_sep"] = "remove"
+        opts = {**default_opts, "numeric_thousand_sep": "remove"}
         result = normalize_numeric_text("1,234,567", opts)
         assert "," not in result
 
     def test_percent_to_numeric(self, default_opts):
         """Convert percent to numeric."""
-        opts = default_opts.copy()
-        opts["percent_format"] = "numeric"
+        opts = {**default_opts, "percent_format": "numeric"}
         result = normalize_numeric_text("50%", opts)
         assert "%" not in result
 
     def test_percent_divide_100(self, default_opts):
         """Divide percent by 100 when configured."""
-        opts = default_opts.copy()
-        opts["percent_format"] = "numeric"
-        opts["percent_divide_100"] = True
+        opts = {**default_opts, "percent_format": "numeric", "percent_divide_100": True}
         result = normalize_numeric_text("50%", opts)
         assert float(result) == 0.5
 
@@ -286,6 +270,13 @@ class TestNormalizeNumericText:
         result = normalize_numeric_text("Hello", default_opts)
         assert result == "Hello"
 
+    def test_normalization_enabled(self, default_opts):
+        """Default "keep" options leave numeric text untouched."""
+        assert numeric_normalization_enabled(default_opts) is False
+        for key, value in (("currency_symbol", "strip"), ("numeric_thousand_sep", "remove"), ("percent_format", "numeric")):
+            opts = {**default_opts, key: value}
+            assert numeric_normalization_enabled(opts) is True
+
 
 # ============================================================
 # Tests for md_escape
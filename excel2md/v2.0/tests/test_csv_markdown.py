@@ -3,7 +3,6 @@ Unit tests for CSV Markdown output functions.
 """
 import pytest
 import sys
-import tempfile
 from pathlib import Path
 from io import StringIO
 
@@ -168,8 +167,7 @@ class TestExtractPrintAreaForCSV:
     def test_hyperlink_inline_plain(self, worksheet_with_hyperlinks, default_opts):
         """Hyperlinks in inline_plain mode."""
         ws = worksheet_with_hyperlinks
-        opts = default_opts.copy()
-        opts['hyperlink_mode'] = 'inline_plain'
+        opts = {**default_opts, 'hyperlink_mode': 'inline_plain'}
         area = (1, 1, 3, 1)
         merged_lookup = build_merged_lookup(ws, area)
 
@@ -210,256 +208,227 @@ class TestExtractPrintAreaForCSV:
 class TestWriteCSVMarkdown:
     """Tests for CSV Markdown file writing."""
 
-    def test_with_description(self, empty_workbook, sample_csv_data_dict, default_opts):
-        """CSV markdown with description section (default)."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            opts = default_opts.copy()
-            opts['csv_include_description'] = True
-            opts['csv_include_metadata'] = False  # Disable to simplify test
-
-            result = write_csv_markdown(
-                empty_workbook,
-                sample_csv_data_dict,
-                'test_file',
-                opts,
-                tmpdir
-            )
-
-            assert result is not None
-            content = Path(result).read_text(encoding='utf-8')
-
-            # Should have description section
-            assert '## 概要' in content
-            assert '### CSV生成方法' in content
-            assert '### CSV形式の仕様' in content
-
-    def test_without_description(self, empty_workbook, sample_csv_data_dict, default_opts):
-        """CSV markdown without description section."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            opts = default_opts.copy()
-            opts['csv_include_description'] = False
-            opts['csv_include_metadata'] = False
-
-            result = write_csv_markdown(
-                empty_workbook,
-                sample_csv_data_dict,
-                'test_file',
-                opts,
-                tmpdir
-            )
-
-            assert result is not None
-            content = Path(result).read_text(encoding='utf-8')
-
-            # Should NOT have description section
-            assert '## 概要' not in content
-            assert '### CSV生成方法' not in content
-
-    def test_with_metadata(self, empty_workbook, sample_csv_data_dict, default_opts):
+    @pytest.mark.parametrize("include_description, must_have, must_not_have", [
+        # Description section (default)
+        (True, ['## 概要', '### CSV生成方法', '### CSV形式の仕様'], []),
+        # No description section, and no metadata section when metadata is off
+        (False, [], ['## 概要', '### CSV生成方法', '## 検証用メタデータ']),
+    ])
+    def test_description_flag(self, empty_workbook, sample_csv_data_dict, default_opts,
+                              include_description, must_have, must_not_have):
+        """csv_include_description toggles the overview sections."""
+        opts = {
+            **default_opts,
+            'csv_include_description': include_description,
+            'csv_include_metadata': False,  # Disable to simplify test
+        }
+
+        buf = StringIO()
+        result = write_csv_markdown(
+            empty_workbook,
+            sample_csv_data_dict,
+            'test_file',
+            opts,
+            None,
+            out_stream=buf,
+        )
+
+        assert result is not None
+        content = buf.getvalue()
+        for text in must_have:
+            assert text in content
+        for text in must_not_have:
+            assert text not in content
+
+    def test_with_metadata(self, empty_workbook, sample_csv_data_dict, default_opts, tmp_path):
         """CSV markdown with metadata section."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            opts = default_opts.copy()
-            opts['csv_include_description'] = False
-            opts['csv_include_metadata'] = True
-
-            result = write_csv_markdown(
-                empty_workbook,
-                sample_csv_data_dict,
-                'test_file',
-                opts,
-                tmpdir
-            )
-
-            assert result is not None
-            content = Path(result).read_text(encoding='utf-8')
-
-            # Should have metadata section (added by verify_csv_markdown)
-            # The metadata is appended by the module, so we just check file exists
-            assert Path(result).exists()
-
-    def test_without_metadata(self, empty_workbook, sample_csv_data_dict, default_opts):
-        """CSV markdown without metadata section."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            opts = default_opts.copy()
-            opts['csv_include_description'] = False
-            opts['csv_include_metadata'] = False
-
-            result = write_csv_markdown(
-                empty_workbook,
-                sample_csv_data_dict,
-                'test_file',
-                opts,
-                tmpdir
-            )
-
-            assert result is not None
-            content = Path(result).read_text(encoding='utf-8')
-
-            # Should NOT have metadata section
-            assert '## 検証用メタデータ' not in content
+        opts = {**default_opts, 'csv_include_description': False, 'csv_include_metadata': True}
+
+        result = write_csv_markdown(
+            empty_workbook,
+            sample_csv_data_dict,
+            'test_file',
+            opts,
+            tmp_path
+        )
+
+        assert result is not None
+
+        # Should have metadata section (added by verify_csv_markdown)
+        # The metadata is appended by the module, so we just check file exists
+        assert Path(result).exists()
 
     def test_with_mermaid(self, empty_workbook, default_opts):
         """CSV markdown with Mermaid block."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            # Create data with Mermaid content
-            csv_data = {
-                'Sheet1': {
-                    'rows': [['A', 'B'], ['1', '2']],
-                    'range': 'A1:B2',
-                    'area': (1, 1, 2, 2),
-                    'mermaid': '```mermaid\nflowchart TD\n  A --> B\n```',
-                }
+        # Create data with Mermaid content
+        csv_data = {
+            'Sheet1': {
+                'rows': [['A', 'B'], ['1', '2']],
+                'range': 'A1:B2',
+                'area': (1, 1, 2, 2),
+                'mermaid': '```mermaid\nflowchart TD\n  A --> B\n```',
             }
+        }
 
-            opts = default_opts.copy()
-            opts['csv_include_description'] = False
-            opts['csv_include_metadata'] = False
+        opts = {**default_opts, 'csv_include_description': False, 'csv_include_metadata': False}
 
-            result = write_csv_markdown(
-                empty_workbook,
-                csv_data,
-                'test_file',
-                opts,
-                tmpdir
-            )
+        buf = StringIO()
+        result = write_csv_markdown(
+            empty_workbook,
+            csv_data,
+            'test_file',
+            opts,
+            None,
+            out_stream=buf,
+        )
 
-            assert result is not None
-            content = Path(result).read_text(encoding='utf-8')
+        assert result is not None
+        content = buf.getvalue()
 
-            # Should have Mermaid block
-            assert '```mermaid' in content
-            assert 'flowchart' in content
+        # Should have Mermaid block
+        assert '```mermaid' in content
+        assert 'flowchart' in content
 
     def test_csv_code_block(self, empty_workbook, sample_csv_data_dict, default_opts):
         """CSV data should be in code block."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            opts = default_opts.copy()
-            opts['csv_include_description'] = False
-            opts['csv_include_metadata'] = False
+        opts = {**default_opts, 'csv_include_description': False, 'csv_include_metadata': False}
 
-            result = write_csv_markdown(
-                empty_workbook,
-                sample_csv_data_dict,
-                'test_file',
-                opts,
-                tmpdir
-            )
+        buf = StringIO()
+        result = write_csv_markdown(
+            empty_workbook,
+            sample_csv_data_dict,
+            'test_file',
+            opts,
+            None,
+            out_stream=buf,
+        )
 
-            content = Path(result).read_text(encoding='utf-8')
+        content = buf.getvalue()
 
-            # Should have CSV code block
-            assert '```csv' in content
-            assert '```' in content
+        # Should have CSV code block
+        assert '```csv' in content
+        assert '```' in content
 
     def test_multi_sheet(self, empty_workbook, sample_csv_data_dict_multi_sheet, default_opts):
         """Multiple sheets should all be included."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            opts = default_opts.copy()
-            opts['csv_include_description'] = False
-            opts['csv_include_metadata'] = False
+        opts = {**default_opts, 'csv_include_description': False, 'csv_include_metadata': False}
 
-            result = write_csv_markdown(
-                empty_workbook,
-                sample_csv_data_dict_multi_sheet,
-                'test_file',
-                opts,
-                tmpdir
-            )
+        buf = StringIO()
+        result = write_csv_markdown(
+            empty_workbook,
+            sample_csv_data_dict_multi_sheet,
+            'test_file',
+            opts,
+            None,
+            out_stream=buf,
+        )
 
-            content = Path(result).read_text(encoding='utf-8')
+        content = buf.getvalue()
 
-            # Should have both sheet headers
-            assert '## Sheet1' in content
-            assert '## Sheet2' in content
+        # Should have both sheet headers
+        assert '## Sheet1' in content
+        assert '## Sheet2' in content
 
     def test_single_sheet_format(self, empty_workbook, sample_csv_data_dict, default_opts):
         """Single sheet should use simplified format."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            opts = default_opts.copy()
-            opts['csv_include_description'] = True
-            opts['csv_include_metadata'] = False
-
-            result = write_csv_markdown(
-                empty_workbook,
-                sample_csv_data_dict,
-                'test_file',
-                opts,
-                tmpdir
-            )
-
-            content = Path(result).read_text(encoding='utf-8')
-
-            # Single sheet mode uses H1 for sheet name
-            assert '# Sheet1' in content
-            # Should not have "## Sheet1" (that's multi-sheet format)
-            lines = content.split('\n')
-            h2_sheet1 = any(line.strip() == '## Sheet1' for line in lines)
-            assert not h2_sheet1
-
-    def test_output_filename(self, empty_workbook, sample_csv_data_dict, default_opts):
+        opts = {**default_opts, 'csv_include_description': True, 'csv_include_metadata': False}
+
+        buf = StringIO()
+        result = write_csv_markdown(
+            empty_workbook,
+            sample_csv_data_dict,
+            'test_file',
+            opts,
+            None,
+            out_stream=buf,
+        )
+
+        content = buf.getvalue()
+
+        # Single sheet mode uses H1 for sheet name
+        assert '# Sheet1' in content
+        # Should not have "## Sheet1" (that's multi-sheet format)
+        lines = content.split('\n')
+        h2_sheet1 = any(line.strip() == '## Sheet1' for line in lines)
+        assert not h2_sheet1
+
+    def test_stream_matches_file(self, empty_workbook, sample_csv_data_dict, default_opts, tmp_path):
+        """Stream output should match the file written to output_dir."""
+        opts = {**default_opts, 'csv_include_metadata': False}
+
+        result = write_csv_markdown(
+            empty_workbook,
+            sample_csv_data_dict,
+            'test_file',
+            opts,
+            tmp_path
+        )
+        buf = StringIO()
+        write_csv_markdown(empty_workbook, sample_csv_data_dict, 'test_file', opts, None, out_stream=buf)
+
+        # Timestamps only appear in multi-sheet output
+        assert buf.getvalue() == Path(result).read_text(encoding='utf-8')
+
+    def test_output_filename(self, empty_workbook, sample_csv_data_dict, default_opts, tmp_path):
         """Output file should have correct name."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            opts = default_opts.copy()
-            opts['csv_include_metadata'] = False
+        opts = {**default_opts, 'csv_include_metadata': False}
 
-            result = write_csv_markdown(
-                empty_workbook,
-                sample_csv_data_dict,
-                'my_excel_file',
-                opts,
-                tmpdir
-            )
+        result = write_csv_markdown(
+            empty_workbook,
+            sample_csv_data_dict,
+            'my_excel_file',
+            opts,
+            tmp_path
+        )
 
-            assert result.endswith('my_excel_file_csv.md')
+        assert result.endswith('my_excel_file_csv.md')
 
-    def test_empty_data(self, empty_workbook, default_opts):
+    def test_empty_data(self, empty_workbook, default_opts, tmp_path):
         """Empty data should return None."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            result = write_csv_markdown(
-                empty_workbook,
-                {},
-                'test_file',
-                default_opts,
-                tmpdir
-            )
+        result = write_csv_markdown(
+            empty_workbook,
+            {},
+            'test_file',
+            default_opts,
+            tmp_path
+        )
 
-            assert result is None
+        assert result is None
 
     def test_csv_escaping(self, empty_workbook, default_opts):
         """CSV special characters should be escaped properly."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            csv_data = {
-                'Sheet1': {
-                    'rows': [
-                        ['Name', 'Value'],
-                        ['Test, with comma', 'Normal'],
-                        ['Test "with" quotes', 'Also normal'],
-                    ],
-                    'range': 'A1:B3',
-                    'area': (1, 1, 3, 2),
-                    'mermaid': None,
-                }
+        csv_data = {
+            'Sheet1': {
+                'rows': [
+                    ['Name', 'Value'],
+                    ['Test, with comma', 'Normal'],
+                    ['Test "with" quotes', 'Also normal'],
+                ],
+                'range': 'A1:B3',
+                'area': (1, 1, 3, 2),
+                'mermaid': None,
             }
+        }
 
-            opts = default_opts.copy()
-            opts['csv_include_description'] = False
-            opts['csv_include_metadata'] = False
+        opts = {**default_opts, 'csv_include_description': False, 'csv_include_metadata': False}
 
-            result = write_csv_markdown(
-                empty_workbook,
-                csv_data,
-                'test_file',
-                opts,
-                tmpdir
-            )
+        buf = StringIO()
+        result = write_csv_markdown(
+            empty_workbook,
+            csv_data,
+            'test_file',
+            opts,
+            None,
+            out_stream=buf,
+        )
 
-            content = Path(result).read_text(encoding='utf-8')
+        content = buf.getvalue()
 
-            # CSV should properly escape commas and quotes
-            # Commas in field require quoting
-            assert '"Test, with comma"' in content or 'Test, with comma' in content
-            # Quotes in field require escaping
-            assert '""' in content or '"with"' in content
+        # CSV should properly escape commas and quotes
+        # Commas in field require quoting
+        assert '"Test, with comma"' in content or 'Test, with comma' in content
+        # Quotes in field require escaping
+        assert '""' in content or '"with"' in content
 
 
 # ============================================================
@@ -469,36 +438,34 @@ class TestWriteCSVMarkdown:
 class TestCSVMarkdownIntegration:
     """Integration tests for CSV Markdown output."""
 
-    def test_full_flow(self, simple_worksheet, default_opts):
+    def test_full_flow(self, simple_worksheet, default_opts, tmp_path):
         """Full extraction to CSV Markdown flow."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            ws = simple_worksheet
-            wb = ws.parent
-            area = (1, 1, 2, 2)
-            merged_lookup = build_merged_lookup(ws, area)
-
-            # Extract CSV data
-            rows = extract_print_area_for_csv(ws, area, default_opts, merged_lookup)
-
-            # Build data dict
-            csv_data = {
-                ws.title: {
-                    'rows': rows,
-                    'range': coords_to_excel_range(*area),
-                    'area': area,
-                    'mermaid': None,
-                }
+        ws = simple_worksheet
+        wb = ws.parent
+        area = (1, 1, 2, 2)
+        merged_lookup = build_merged_lookup(ws, area)
+
+        # Extract CSV data
+        rows = extract_print_area_for_csv(ws, area, default_opts, merged_lookup)
+
+        # Build data dict
+        csv_data = {
+            ws.title: {
+                'rows': rows,
+                'range': coords_to_excel_range(*area),
+                'area': area,
+                'mermaid': None,
             }
+        }
 
-            # Write CSV Markdown
-            opts = default_opts.copy()
-            opts['csv_include_metadata'] = False
+        # Write CSV Markdown
+        opts = {**default_opts, 'csv_include_metadata': False}
 
-            result = write_csv_markdown(wb, csv_data, 'test', opts, tmpdir)
+        result = write_csv_markdown(wb, csv_data, 'test', opts, tmp_path)
 
-            assert result is not None
-            content = Path(result).read_text(encoding='utf-8')
+        assert result is not None
+        content = Path(result).read_text(encoding='utf-8')
 
-            # Verify content
-            assert 'Header1' in content
-            assert 'Data1' in content
+        # Verify content
+        assert 'Header1' in content
+        assert 'Data1' in content
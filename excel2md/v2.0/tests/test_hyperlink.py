@@ -4,6 +4,7 @@ Unit tests for hyperlink processing functions.
 import pytest
 import sys
 from pathlib import Path
+from types import SimpleNamespace as NS
 from unittest.mock import MagicMock
 
 # Add parent directory to path
@@ -12,8 +13,9 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 from excel_to_md import (
     hyperlink_info,
     is_valid_url,
+    extract_table,
+    build_merged_lookup,
 )
-from openpyxl.cell.cell import Cell
 
 
 def create_mock_cell(value=None, fill_color=None, hyperlink_target=None,
@@ -21,38 +23,17 @@ def create_mock_cell(value=None, fill_color=None, hyperlink_target=None,
     """
     Create a mock cell for testing.
     """
-    cell = MagicMock(spec=Cell)
-    cell.value = value
-    cell.is_date = is_date
-
-    # Fill setup
-    if fill_color:
-        cell.fill = MagicMock()
-        cell.fill.patternType = 'solid'
-        cell.fill.fgColor = MagicMock()
-        cell.fill.fgColor.rgb = fill_color
-        cell.fill.fgColor.type = 'rgb'
-    else:
-        cell.fill = MagicMock()
-        cell.fill.patternType = None
-
-    # Hyperlink setup
+    hyperlink = None
     if hyperlink_target or hyperlink_location:
-        cell.hyperlink = MagicMock()
-        cell.hyperlink.target = hyperlink_target
-        cell.hyperlink.location = hyperlink_location
-        cell.hyperlink.display = str(value) if value else None
+        hyperlink = NS(target=hyperlink_target, location=hyperlink_location,
+                       display=str(value) if value else None)
+    if fill_color:
+        fill = NS(patternType='solid', fgColor=NS(rgb=fill_color, type='rgb'), bgColor=NS(rgb=None, type=None))
     else:
-        cell.hyperlink = None
-
-    # Border setup (no borders by default)
-    cell.border = MagicMock()
-    cell.border.left = MagicMock(style=None)
-    cell.border.right = MagicMock(style=None)
-    cell.border.top = MagicMock(style=None)
-    cell.border.bottom = MagicMock(style=None)
-
-    return cell
+        fill = NS(patternType=None)
+    # No borders by default
+    border = NS(left=NS(style=None), right=NS(style=None), top=NS(style=None), bottom=NS(style=None))
+    return NS(value=value, is_date=is_date, fill=fill, hyperlink=hyperlink, border=border)
 
 
 # ============================================================
@@ -237,22 +218,24 @@ class TestIsValidUrl:
 # Tests for hyperlink processing in extract_table
 # ============================================================
 
+@pytest.fixture
+def ws_with_ml(worksheet_with_hyperlinks):
+    """Hyperlink worksheet together with its merged-cell lookup."""
+    return worksheet_with_hyperlinks, build_merged_lookup(worksheet_with_hyperlinks)
+
+
 class TestHyperlinkInExtraction:
     """Integration tests for hyperlink processing during extraction."""
 
-    def test_inline_mode(self, worksheet_with_hyperlinks, default_opts):
+    def test_inline_mode(self, ws_with_ml, default_opts):
         """Hyperlink in inline mode should produce markdown link."""
-        from excel_to_md import extract_table, build_merged_lookup
-
-        ws = worksheet_with_hyperlinks
-        opts = default_opts.copy()
-        opts['hyperlink_mode'] = 'inline'
+        ws, merged_lookup = ws_with_ml
+        opts = {**default_opts, 'hyperlink_mode': 'inline'}
 
         table = {
             'bbox': (1, 1, 3, 1),
             'mask': {(1, 1), (2, 1), (3, 1)},
         }
-        merged_lookup = build_merged_lookup(ws)
         footnotes = []
 
         md_rows, note_refs, truncated, title = extract_table(
@@ -262,19 +245,15 @@ class TestHyperlinkInExtraction:
         # First cell should have markdown link format
         assert '[' in md_rows[0][0] or 'External Link' in md_rows[0][0]
 
-    def test_inline_plain_mode(self, worksheet_with_hyperlinks, default_opts):
+    def test_inline_plain_mode(self, ws_with_ml, default_opts):
         """Hyperlink in inline_plain mode should produce text with URL."""
-        from excel_to_md import extract_table, build_merged_lookup
-
-        ws = worksheet_with_hyperlinks
-        opts = default_opts.copy()
-        opts['hyperlink_mode'] = 'inline_plain'
+        ws, merged_lookup = ws_with_ml
+        opts = {**default_opts, 'hyperlink_mode': 'inline_plain'}
 
         table = {
             'bbox': (1, 1, 3, 1),
             'mask': {(1, 1), (2, 1), (3, 1)},
         }
-        merged_lookup = build_merged_lookup(ws)
         footnotes = []
 
         md_rows, note_refs, truncated, title = extract_table(
@@ -285,19 +264,15 @@ class TestHyperlinkInExtraction:
         first_cell = md_rows[0][0]
         assert 'External Link' in first_cell or '(' in first_cell
 
-    def test_footnote_mode(self, worksheet_with_hyperlinks, default_opts):
+    def test_footnote_mode(self, ws_with_ml, default_opts):
         """Hyperlink in footnote mode should produce footnote reference."""
-        from excel_to_md import extract_table, build_merged_lookup
-
-        ws = worksheet_with_hyperlinks
-        opts = default_opts.copy()
-        opts['hyperlink_mode'] = 'footnote'
+        ws, merged_lookup = ws_with_ml
+        opts = {**default_opts, 'hyperlink_mode': 'footnote'}
 
         table = {
             'bbox': (1, 1, 3, 1),
             'mask': {(1, 1), (2, 1), (3, 1)},
         }
-        merged_lookup = build_merged_lookup(ws)
         footnotes = []
 
         md_rows, note_refs, truncated, title = extract_table(
@@ -308,19 +283,15 @@ class TestHyperlinkInExtraction:
         first_cell = md_rows[0][0]
         assert '[^' in first_cell or len(note_refs) > 0
 
-    def test_text_only_mode(self, worksheet_with_hyperlinks, default_opts):
+    def test_text_only_mode(self, ws_with_ml, default_opts):
         """Hyperlink in text_only mode should only show display text."""
-        from excel_to_md import extract_table, build_merged_lookup
-
-        ws = worksheet_with_hyperlinks
-        opts = default_opts.copy()
-        opts['hyperlink_mode'] = 'text_only'
+        ws, merged_lookup = ws_with_ml
+        opts = {**default_opts, 'hyperlink_mode': 'text_only'}
 
         table = {
             'bbox': (1, 1, 3, 1),
             'mask': {(1, 1), (2, 1), (3, 1)},
         }
-        merged_lookup = build_merged_lookup(ws)
         footnotes = []
 
         md_rows, note_refs, truncated, title = extract_table(
@@ -331,19 +302,15 @@ class TestHyperlinkInExtraction:
         first_cell = md_rows[0][0]
         assert 'example.com' not in first_cell or 'External Link' in first_cell
 
-    def test_no_hyperlink_cell(self, worksheet_with_hyperlinks, default_opts):
+    def test_no_hyperlink_cell(self, ws_with_ml, default_opts):
         """Cell without hyperlink should just have text."""
-        from excel_to_md import extract_table, build_merged_lookup
-
-        ws = worksheet_with_hyperlinks
-        opts = default_opts.copy()
-        opts['hyperlink_mode'] = 'inline'
+        ws, merged_lookup = ws_with_ml
+        opts = {**default_opts, 'hyperlink_mode': 'inline'}
 
         table = {
             'bbox': (3, 1, 3, 1),  # Only the "No Link" cell
             'mask': {(3, 1)},
         }
-        merged_lookup = build_merged_lookup(ws)
         footnotes = []
 
         md_rows, note_refs, truncated, title = extract_table(
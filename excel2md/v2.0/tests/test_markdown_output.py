@@ -14,6 +14,9 @@ from excel_to_md import (
     detect_right_align,
     choose_header_row_heuristic,
     build_merged_lookup,
+    build_merged_by_top_left,
+    detect_table_title,
+    grid_to_tables,
 )
 
 
@@ -287,8 +290,7 @@ class TestExtractTable:
     def test_max_cells_truncation(self, simple_worksheet, default_opts):
         """Table extraction should truncate at max_cells."""
         ws = simple_worksheet
-        opts = default_opts.copy()
-        opts['max_cells_per_table'] = 2  # Very low limit
+        opts = {**default_opts, 'max_cells_per_table': 2}  # Very low limit
 
         table = {
             'bbox': (1, 1, 2, 2),
@@ -297,21 +299,14 @@ class TestExtractTable:
         merged_lookup = build_merged_lookup(ws)
         footnotes = []
 
-        # extract_table returns 3 values when truncated, 4 values normally
-        result = extract_table(
+        md_rows, note_refs, truncated, title = extract_table(
             ws, table, opts, footnotes, 1, merged_lookup
         )
 
-        # Should be truncated (4 cells > 2 limit)
-        # When truncated, returns (md_rows, note_refs, True)
-        # When not truncated, returns (md_rows, note_refs, False, title)
-        if len(result) == 3:
-            md_rows, note_refs, truncated = result
-            assert truncated is True
-        else:
-            md_rows, note_refs, truncated, title = result
-            # May not be truncated if processing is different
-            assert isinstance(truncated, bool)
+        # Should be truncated (4 cells > 2 limit): only the first row fits
+        assert truncated is True
+        assert md_rows == [['Header1', 'Header2']]
+        assert title is None
 
     def test_empty_table(self, empty_workbook, default_opts):
         """Empty table extraction."""
@@ -329,6 +324,38 @@ class TestExtractTable:
 
         assert len(md_rows) == 0 or all(not any(cell for cell in row) for row in md_rows)
 
+    def test_merged_title_row(self, empty_workbook, default_opts):
+        """A wide merged cell at the top becomes the table title."""
+        ws = empty_workbook.active
+        ws['A1'] = 'Report'
+        ws.merge_cells('A1:C1')
+        for ref, value in (('A2', 'H1'), ('B2', 'H2'), ('C2', 'H3'), ('D2', 'H4')):
+            ws[ref] = value
+        table = {
+            'bbox': (1, 1, 2, 4),
+            'mask': {(r, c) for r in (1, 2) for c in range(1, 5)},
+        }
+        merged_lookup = build_merged_lookup(ws)
+
+        for merged_by_tl in (None, build_merged_by_top_left(ws)):
+            md_rows, note_refs, truncated, title = extract_table(
+                ws, table, default_opts, [], 1, merged_lookup, merged_by_tl=merged_by_tl
+            )
+            assert title == 'Report'
+            assert md_rows == [['H4']]
+
+        title, title_cols = detect_table_title(ws, table, merged_lookup, default_opts)
+        assert title == 'Report'
+        assert list(title_cols) == [1, 2, 3]
+        assert 4 not in title_cols
+
+    def test_no_title_without_merged_cells(self, simple_worksheet, default_opts):
+        """Without merged cells there is no title and no title columns."""
+        table = {'bbox': (1, 1, 2, 2), 'mask': {(1, 1), (1, 2), (2, 1), (2, 2)}}
+        title, title_cols = detect_table_title(simple_worksheet, table, build_merged_lookup(simple_worksheet), default_opts)
+        assert title is None
+        assert len(title_cols) == 0
+
 
 # ============================================================
 # Integration tests for Markdown output
@@ -339,8 +366,6 @@ class TestMarkdownOutputIntegration:
 
     def test_full_flow_simple(self, simple_worksheet, default_opts):
         """Full extraction to Markdown flow."""
-        from excel_to_md import grid_to_tables
-
         ws = simple_worksheet
         area = (1, 1, 2, 2)
         tables = grid_to_tables(ws, area, hidden_policy="ignore", opts=default_opts)
@@ -361,8 +386,6 @@ class TestMarkdownOutputIntegration:
 
     def test_full_flow_with_numbers(self, worksheet_with_numbers, default_opts):
         """Full flow with numeric data."""
-        from excel_to_md import grid_to_tables
-
         ws = worksheet_with_numbers
         area = (1, 1, 4, 2)
         tables = grid_to_tables(ws, area, hidden_policy="ignore", opts=default_opts)
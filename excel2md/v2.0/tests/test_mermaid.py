@@ -15,6 +15,8 @@ from excel_to_md import (
     format_table_as_text_or_nested,
     has_border,
     build_merged_lookup,
+    _v14_escape_mermaid_text,
+    build_mermaid,
 )
 from openpyxl.cell.cell import Cell
 
@@ -410,6 +412,56 @@ class TestMermaidGeneration:
             assert opt in default_opts
 
 
+class TestEscapeMermaidText:
+    """Tests for Mermaid display-text escaping."""
+
+    def test_brackets_and_quotes(self):
+        """Mermaid syntax characters should become HTML entities."""
+        result = _v14_escape_mermaid_text('[A]{B}|"C"\'')
+        assert result == "&#91;A&#93;&#123;B&#125;&#124;&quot;C&quot;&#39;"
+
+    def test_html_special_chars(self):
+        """<, > and & should be escaped."""
+        assert _v14_escape_mermaid_text("a<b>c&d") == "a&lt;b&gt;c&amp;d"
+
+    def test_no_double_escape(self):
+        """Entities produced for other characters must not be re-escaped."""
+        assert _v14_escape_mermaid_text("&[") == "&amp;&#91;"
+        assert _v14_escape_mermaid_text("&#91;") == "&amp;#91;"
+
+    def test_empty(self):
+        """Empty or None input returns empty string."""
+        assert _v14_escape_mermaid_text("") == ""
+        assert _v14_escape_mermaid_text(None) == ""
+
+
+class TestBuildMermaid:
+    """Tests for table-based Mermaid flowchart generation."""
+
+    def test_edges_emitted_in_row_order(self):
+        """Edges should follow source row order, not sorted order."""
+        md_rows = [
+            ['From', 'To', 'Label'],
+            ['Zeta', 'Alpha', ''],
+            ['Alpha', 'Beta', 'ok'],
+        ]
+        colmap = {'from': 0, 'to': 1, 'label': 2, 'group': None, 'note': None}
+        result = build_mermaid(md_rows, {}, colmap)
+        lines = result.split("\n")
+        assert lines.index('  Zeta --> Alpha') < lines.index('  Alpha -->|ok| Beta')
+
+    def test_duplicate_edges_removed(self):
+        """Duplicate edges should be emitted once."""
+        md_rows = [
+            ['From', 'To'],
+            ['A', 'B'],
+            ['A', 'B'],
+        ]
+        colmap = {'from': 0, 'to': 1, 'label': None, 'group': None, 'note': None}
+        result = build_mermaid(md_rows, {}, colmap)
+        assert result.count('  A --> B') == 1
+
+
 # ============================================================
 # Integration tests for code block output
 # ============================================================
@@ -0,0 +1,135 @@
+"""
+Unit tests for sheet-level orchestration (run, --workers).
+"""
+import pytest
+import shutil
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import openpyxl
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from excel_to_md import build_argparser, run
+from excel2md import runner
+from excel2md.runner import _resolve_workers
+
+
+@pytest.fixture(scope="module")
+def multi_sheet_xlsx(tmp_path_factory):
+    """Saved 3-sheet workbook with numbers, a merged title and a hyperlink per sheet."""
+    wb = openpyxl.Workbook()
+    for i in range(3):
+        ws = wb.active if i == 0 else wb.create_sheet()
+        ws.title = f"Sheet{i + 1}"
+        ws['A1'] = f'Title {i + 1}'
+        ws.merge_cells('A1:C1')
+        ws['A2'] = 'Name'
+        ws['B2'] = 'Value'
+        ws['C2'] = 'Link'
+        for r in range(3, 6):
+            ws.cell(row=r, column=1, value=f'item{r}')
+            ws.cell(row=r, column=2, value=r * (i + 1) * 1000)
+        ws['C3'] = 'site'
+        ws['C3'].hyperlink = f'https://example.com/{i}'
+    path = tmp_path_factory.mktemp("book") / "book.xlsx"
+    wb.save(path)
+    return path
+
+
+def _run_in(tmp_path, xlsx, name, argv):
+    """Copy xlsx into its own directory, run the converter there and return {file name: text}."""
+    out_dir = tmp_path / name
+    out_dir.mkdir()
+    src = out_dir / xlsx.name
+    shutil.copy(xlsx, src)
+    args = build_argparser().parse_args([str(src)] + argv)
+    run(str(src), args.output, args)
+    return {p.name: p.read_text(encoding="utf-8") for p in out_dir.iterdir() if p.suffix == ".md"}
+
+
+# ============================================================
+# Tests for _resolve_workers
+# ============================================================
+
+class TestResolveWorkers:
+    """Tests for the --workers value resolution."""
+
+    @pytest.mark.parametrize("requested", [None, -1, -8])
+    def test_none_or_negative_is_serial(self, requested):
+        """None or a negative count runs serially."""
+        assert _resolve_workers(requested, 5) == 1
+
+    def test_zero_is_auto(self, monkeypatch):
+        """0 picks min(sheet count, CPU count)."""
+        monkeypatch.setattr("os.cpu_count", lambda: 4)
+        assert _resolve_workers(0, 10) == 4
+        assert _resolve_workers(0, 3) == 3
+
+    def test_zero_without_cpu_count(self, monkeypatch):
+        """0 falls back to 1 when the CPU count is unknown."""
+        monkeypatch.setattr("os.cpu_count", lambda: None)
+        assert _resolve_workers(0, 10) == 1
+
+    def test_capped_at_sheet_count(self):
+        """No more workers than sheets."""
+        assert _resolve_workers(8, 3) == 3
+        assert _resolve_workers(2, 3) == 2
+
+    def test_at_least_one(self):
+        """A workbook without sheets still resolves to one worker."""
+        assert _resolve_workers(4, 0) == 1
+
+
+# ============================================================
+# Tests for run() with --workers
+# ============================================================
+
+class TestRunWorkers:
+    """Parallel sheet conversion must write the same files as serial conversion."""
+
+    @pytest.mark.parametrize("split", [False, True], ids=["single", "split_by_sheet"])
+    @pytest.mark.parametrize("csv_args", [
+        ["--no-csv-markdown-enabled"],
+        ["--no-csv-include-metadata"],  # metadata carries a timestamp
+    ], ids=["markdown", "csv_markdown"])
+    def test_outputs_match_serial(self, tmp_path, multi_sheet_xlsx, split, csv_args):
+        """--workers 2 writes the same files with the same content as --workers 1."""
+        argv = csv_args + (["--split-by-sheet"] if split else [])
+        serial = _run_in(tmp_path, multi_sheet_xlsx, "serial", argv + ["--workers", "1"])
+        parallel = _run_in(tmp_path, multi_sheet_xlsx, "parallel", argv + ["--workers", "2"])
+        assert serial
+        assert len(serial) == (3 if split else 1)
+        assert parallel == serial
+
+    def test_warn_once_across_workers(self, tmp_path, multi_sheet_xlsx, capfd, monkeypatch):
+        """The CSV footnote fallback warning is printed once, not once per worker."""
+        # Start from a fresh warn-once state; earlier tests may have warned in this process
+        monkeypatch.setattr("excel2md.output._warned_once", set())
+        _run_in(tmp_path, multi_sheet_xlsx, "parallel", ["--no-csv-include-metadata", "--workers", "2"])
+        err = capfd.readouterr().err
+        assert err.count("CSV markdown does not support footnote mode") == 1
+
+    def test_write_pool_shut_down_on_sheet_failure(self, tmp_path, multi_sheet_xlsx, monkeypatch):
+        """A failing sheet still shuts down the split-output write pool."""
+        shutdowns = []
+
+        class RecordingPool(ThreadPoolExecutor):
+            def shutdown(self, *args, **kwargs):
+                shutdowns.append(kwargs)
+                super().shutdown(*args, **kwargs)
+
+        process_sheet = runner._process_sheet
+
+        def failing_process_sheet(wb, sheet_index, *rest):
+            if sheet_index == 2:
+                raise RuntimeError("sheet failed")
+            return process_sheet(wb, sheet_index, *rest)
+
+        monkeypatch.setattr(runner, "ThreadPoolExecutor", RecordingPool)
+        monkeypatch.setattr(runner, "_process_sheet", failing_process_sheet)
+        with pytest.raises(RuntimeError, match="sheet failed"):
+            _run_in(tmp_path, multi_sheet_xlsx, "failed", ["--no-csv-markdown-enabled", "--split-by-sheet"])
+        assert shutdowns == [{"wait": True, "cancel_futures": True}]
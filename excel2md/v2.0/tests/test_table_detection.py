@@ -5,6 +5,8 @@ import pytest
 import sys
 from pathlib import Path
 
+from openpyxl.styles import PatternFill
+
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
@@ -15,7 +17,9 @@ from excel_to_md import (
     enumerate_histogram_rectangles,
     union_rects,
     bfs_components,
+    rectangles_for_component,
     get_print_areas,
+    merged_range_bounds,
 )
 
 
@@ -159,6 +163,20 @@ class TestBfsComponents:
         assert len(comps) == 0
 
 
+class TestRectanglesForComponent:
+    """Tests for per-component rectangle carving."""
+
+    def test_offset_component(self):
+        """Rectangles should be in grid coordinates, not bbox-relative."""
+        comp = {(5, 7), (5, 8), (6, 7), (6, 8), (7, 7)}
+        rects = rectangles_for_component(comp, (10, 10))
+        assert rects == [(5, 7, 6, 8), (7, 7, 7, 7)]
+
+    def test_empty_component(self):
+        """Empty component should yield no rectangles."""
+        assert rectangles_for_component(set(), (3, 3)) == []
+
+
 # ============================================================
 # Tests for union_rects
 # ============================================================
@@ -209,20 +227,32 @@ class TestUnionRects:
         result = union_rects(rects)
         assert len(result) == 2
 
+    def test_far_apart_rows(self):
+        """Rows far apart should not require sweeping the gap."""
+        rects = [
+            (1, 1, 2, 3),
+            (1000000, 2, 1000001, 4),
+        ]
+        result = union_rects(rects)
+        assert result == [(1, 1, 2, 3), (1000000, 2, 1000001, 4)]
+
 
 # ============================================================
 # Tests for grid_to_tables
 # ============================================================
 
+@pytest.fixture
+def simple_tables(simple_worksheet, default_opts):
+    """Tables detected in the A1:B2 data of simple_worksheet."""
+    return grid_to_tables(simple_worksheet, (1, 1, 2, 2), hidden_policy="ignore", opts=default_opts)
+
+
 class TestGridToTables:
     """Tests for table detection from grid."""
 
-    def test_single_table(self, simple_worksheet, default_opts):
+    def test_single_table(self, simple_tables):
         """Contiguous data should be single table."""
-        ws = simple_worksheet
-        area = (1, 1, 2, 2)  # A1:B2
-        tables = grid_to_tables(ws, area, hidden_policy="ignore", opts=default_opts)
-        assert len(tables) == 1
+        assert len(simple_tables) == 1
 
     def test_split_by_empty_row(self, worksheet_with_empty_rows, default_opts):
         """Empty row should split into 2 tables."""
@@ -231,6 +261,23 @@ class TestGridToTables:
         tables = grid_to_tables(ws, area, hidden_policy="ignore", opts=default_opts)
         assert len(tables) == 2
 
+    def test_split_by_empty_column(self, empty_workbook, default_opts):
+        """Empty column should split into 2 tables."""
+        ws = empty_workbook.active
+        for ref in ('A1', 'A2', 'C1', 'C2'):
+            ws[ref] = ref
+        area = (1, 1, 2, 3)  # A1:C2 with column B empty
+        tables = grid_to_tables(ws, area, hidden_policy="ignore", opts=default_opts)
+        assert [t["bbox"] for t in tables] == [(1, 1, 2, 1), (1, 3, 2, 3)]
+
+    def test_filled_row_does_not_split(self, worksheet_with_empty_rows, default_opts):
+        """A row with only a colored fill is not an empty separator row."""
+        ws = worksheet_with_empty_rows
+        ws['A3'].fill = PatternFill(start_color='FFFF00', end_color='FFFF00', fill_type='solid')
+        area = (1, 1, 5, 2)
+        tables = grid_to_tables(ws, area, hidden_policy="ignore", opts=default_opts)
+        assert len(tables) == 1
+
     def test_all_empty(self, empty_workbook, default_opts):
         """All empty cells should return no tables."""
         ws = empty_workbook.active
@@ -238,24 +285,18 @@ class TestGridToTables:
         tables = grid_to_tables(ws, area, hidden_policy="ignore", opts=default_opts)
         assert len(tables) == 0
 
-    def test_table_has_bbox(self, simple_worksheet, default_opts):
+    def test_table_has_bbox(self, simple_tables):
         """Tables should have bounding box."""
-        ws = simple_worksheet
-        area = (1, 1, 2, 2)
-        tables = grid_to_tables(ws, area, hidden_policy="ignore", opts=default_opts)
-        assert len(tables) == 1
-        assert "bbox" in tables[0]
-        bbox = tables[0]["bbox"]
+        assert len(simple_tables) == 1
+        assert "bbox" in simple_tables[0]
+        bbox = simple_tables[0]["bbox"]
         assert len(bbox) == 4  # (min_row, min_col, max_row, max_col)
 
-    def test_table_has_mask(self, simple_worksheet, default_opts):
+    def test_table_has_mask(self, simple_tables):
         """Tables should have cell mask."""
-        ws = simple_worksheet
-        area = (1, 1, 2, 2)
-        tables = grid_to_tables(ws, area, hidden_policy="ignore", opts=default_opts)
-        assert len(tables) == 1
-        assert "mask" in tables[0]
-        assert isinstance(tables[0]["mask"], set)
+        assert len(simple_tables) == 1
+        assert "mask" in simple_tables[0]
+        assert isinstance(simple_tables[0]["mask"], set)
 
 
 # ============================================================
@@ -288,6 +329,28 @@ class TestBuildNonemptyGrid:
         assert grid[1][0] == 0  # A2 is empty
         assert grid[1][1] == 0  # B2 is empty
 
+    def test_missing_cells_not_created(self, empty_workbook, default_opts):
+        """Scanning an area should not add cells for empty coordinates."""
+        ws = empty_workbook.active
+        ws['A1'] = 'Data'
+        ws['C3'] = 'Data'
+        grid, *_ = build_nonempty_grid(ws, (1, 1, 3, 3), hidden_policy="ignore", opts=default_opts)
+        assert grid == [[1, 0, 0], [0, 0, 0], [0, 0, 1]]
+        assert set(ws._cells) == {(1, 1), (3, 3)}
+
+    def test_hidden_cells_excluded(self, empty_workbook, default_opts):
+        """hidden_policy='exclude' should leave hidden rows/columns as 0."""
+        ws = empty_workbook.active
+        for ref in ('A1', 'B1', 'C1', 'A2', 'B2', 'C2'):
+            ws[ref] = ref
+        ws.row_dimensions[2].hidden = True
+        ws.column_dimensions['B'].hidden = True
+        area = (1, 1, 2, 3)
+        grid, *_ = build_nonempty_grid(ws, area, hidden_policy="exclude", opts=default_opts)
+        assert grid == [[1, 0, 1], [0, 0, 0]]
+        grid, *_ = build_nonempty_grid(ws, area, hidden_policy="ignore", opts=default_opts)
+        assert grid == [[1, 1, 1], [1, 1, 1]]
+
     def test_grid_bounds(self, simple_worksheet, default_opts):
         """Grid bounds should match input area."""
         ws = simple_worksheet
@@ -359,9 +422,35 @@ class TestMergedCellsInGrid:
         assert grid[0][1] == 1  # B1 (part of merged range)
         assert grid[0][2] == 1  # C1 (part of merged range)
 
+    def test_merged_cells_clipped_to_area(self, worksheet_with_merged_cells, default_opts):
+        """Merged influence should not spill outside the area."""
+        ws = worksheet_with_merged_cells
+        area = (1, 1, 1, 2)
+        grid, r0, c0, r1, c1 = build_nonempty_grid(ws, area, hidden_policy="ignore", opts=default_opts)
+        assert grid == [[1, 1]]
+
+    def test_merged_hidden_top_left_exclude(self, empty_workbook, default_opts):
+        """A hidden non-empty cell still marks its merged block under exclude."""
+        ws = empty_workbook.active
+        ws['A1'] = 'Title'
+        ws.merge_cells('A1:B2')
+        ws.row_dimensions[1].hidden = True
+        area = (1, 1, 2, 2)
+        grid, r0, c0, r1, c1 = build_nonempty_grid(ws, area, hidden_policy="exclude", opts=default_opts)
+        assert grid == [[1, 1], [1, 1]]
+
     def test_merged_cells_single_table(self, worksheet_with_merged_cells, default_opts):
         """Merged cells should not split tables."""
         ws = worksheet_with_merged_cells
         area = (1, 1, 3, 3)
         tables = grid_to_tables(ws, area, hidden_policy="ignore", opts=default_opts)
         assert len(tables) == 1  # Should be single table
+
+    def test_shared_merged_range_bounds(self, worksheet_with_merged_cells, default_opts):
+        """Precomputed merged bounds give the same tables as reading ws.merged_cells."""
+        ws = worksheet_with_merged_cells
+        bounds = merged_range_bounds(ws)
+        assert (1, 1, 1, 3) in bounds
+        area = (1, 1, 3, 3)
+        assert grid_to_tables(ws, area, hidden_policy="ignore", opts=default_opts,
+                              merged_ranges=bounds) == grid_to_tables(ws, area, hidden_policy="ignore", opts=default_opts)
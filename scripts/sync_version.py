@@ -19,6 +19,20 @@ import re
 import sys
 from pathlib import Path
 
+try:
+    import tomllib
+except ModuleNotFoundError:  # Python 3.10
+    tomllib = None
+
+# version = "..." の行（tomllib が使えない場合のフォールバック）
+VERSION_LINE_RE = re.compile(r'^version\s*=\s*"([^"]*)"', re.MULTILINE)
+# <span class="font-medium">バージョン:</span> v0.2.4
+VERSION_SPAN_RE = re.compile(r'(<span class="font-medium">バージョン:</span>\s*v)[\d.]+')
+# <p><span class="font-medium">バージョン:</span> v0.2.4</p>
+VERSION_SPAN_P_RE = re.compile(r'(<p><span class="font-medium">バージョン:</span>\s*v)[\d.]+(</p>)')
+# VERSIONS配列の開始部分
+VERSIONS_ARRAY_START = "const VERSIONS = ["
+
 
 def get_root_dir() -> Path:
     """プロジェクトルートディレクトリを取得"""
@@ -98,13 +112,24 @@ def read_backend_version(version_dir: Path) -> str | None:
 
     content = pyproject_file.read_text()
 
-    # version = "..." の行からバージョンを抽出
-    match = re.search(r'^version\s*=\s*"([^"]*)"', content, flags=re.MULTILINE)
-    if not match:
+    data = None
+    if tomllib is not None:
+        try:
+            data = tomllib.loads(content)
+        except tomllib.TOMLDecodeError:
+            pass
+    if data is not None:
+        # [project] または [tool.poetry] の version を読む
+        version = data.get("project", {}).get("version") or data.get("tool", {}).get("poetry", {}).get("version")
+    else:
+        # version = "..." の行からバージョンを抽出
+        match = VERSION_LINE_RE.search(content)
+        version = match.group(1) if match else None
+    if not version:
         print(f"  Warning: version not found in {pyproject_file}", file=sys.stderr)
         return None
 
-    return match.group(1)
+    return version
 
 
 def update_frontend_html(version_dir: Path, version: str) -> bool:
@@ -128,17 +153,15 @@ def update_frontend_html(version_dir: Path, version: str) -> bool:
         updated = False
 
         # パターン1: <span class="font-medium">バージョン:</span> v0.2.4
-        pattern1 = r'(<span class="font-medium">バージョン:</span>\s*v)[\d.]+'
         replacement1 = rf"\g<1>{version}"
-        new_content = re.sub(pattern1, replacement1, content)
+        new_content = VERSION_SPAN_RE.sub(replacement1, content)
         if new_content != content:
             content = new_content
             updated = True
 
         # パターン2: <p><span class="font-medium">バージョン:</span> v0.2.4</p>
-        pattern2 = r'(<p><span class="font-medium">バージョン:</span>\s*v)[\d.]+(</p>)'
         replacement2 = rf"\g<1>{version}\g<2>"
-        new_content = re.sub(pattern2, replacement2, content)
+        new_content = VERSION_SPAN_P_RE.sub(replacement2, content)
         if new_content != content:
             content = new_content
             updated = True
@@ -204,6 +227,31 @@ def generate_versions_array(version_dirs: list[Path]) -> str:
     return "const VERSIONS = [\n" + ",\n".join(entries) + "\n    ];"
 
 
+def find_versions_array(content: str) -> tuple[int, int] | None:
+    """VERSIONS配列（const VERSIONS = [ ... ] または ...];）の範囲を取得
+
+    要素に ] は含まれないため、開始位置以降の最初の ] を配列の終端とする。
+    正規表現のバックトラックを使わず、前方への文字列検索2回で求める。
+
+    Args:
+        content: index.html の内容
+
+    Returns:
+        (開始位置, 終了位置) のタプル。終了位置は ] と直後の ; を含む。
+        VERSIONS配列が見つからない場合はNone。
+    """
+    start = content.find(VERSIONS_ARRAY_START)
+    if start == -1:
+        return None
+    end = content.find("]", start + len(VERSIONS_ARRAY_START))
+    if end == -1:
+        return None
+    end += 1
+    if content.startswith(";", end):
+        end += 1
+    return start, end
+
+
 def update_versions_array(version_dir: Path, versions_array_code: str) -> bool:
     """frontend/index.html の VERSIONS配列を更新
 
@@ -223,14 +271,13 @@ def update_versions_array(version_dir: Path, versions_array_code: str) -> bool:
         content = html_file.read_text()
 
         # VERSIONS配列を検索（複数行にまたがる）
-        # パターン: const VERSIONS = [ ... ];
-        pattern = r'const VERSIONS = \[\s*\n(?:.*\n)*?\s*\];'
-
-        if not re.search(pattern, content):
+        span = find_versions_array(content)
+        if span is None:
             # VERSIONS配列が見つからない場合はスキップ
             return False
 
-        new_content = re.sub(pattern, versions_array_code, content)
+        start, end = span
+        new_content = content[:start] + versions_array_code + content[end:]
 
         if new_content != content:
             html_file.write_text(new_content)